@@ -0,0 +1,89 @@
+"""
+Analysis History Routes
+"""
+
+from fastapi import APIRouter, Depends, Request, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
+import asyncio
+import logging
+
+from app.services.analysis_filter import AnalysisFilter
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+def _get_store(app_request: Request):
+    """Отримання сховища аналізів"""
+    if not hasattr(app_request.app.state, 'analysis_store'):
+        raise HTTPException(status_code=500, detail="Analysis store not available")
+    return app_request.app.state.analysis_store
+
+@router.get("/analyses")
+async def list_analyses(
+    app_request: Request,
+    filters: AnalysisFilter = Depends(),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """Історія аналізів з фільтрами за ID посту, автором та часом"""
+    analysis_store = _get_store(app_request)
+
+    try:
+        items = await analysis_store.query(filters, limit=limit, offset=offset)
+    except Exception as e:
+        logger.error(f"Error querying analyses: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "items": items,
+        "count": len(items),
+        "limit": limit,
+        "offset": offset
+    }
+
+@router.get("/analyses/export")
+async def export_analyses(
+    app_request: Request,
+    filters: AnalysisFilter = Depends(),
+    format: Literal["ndjson", "arrow", "parquet"] = "ndjson",
+    compression: Optional[Literal["gzip", "zstd"]] = None,
+    chunk_size: int = Query(1000, ge=1, le=50000)
+):
+    """Потоковий експорт аналізів (NDJSON / Arrow IPC / Parquet)"""
+    # SQLAlchemy та експорт імпортуються при першому використанні (швидший старт)
+    from app.services.analysis_export import (
+        check_export_dependencies,
+        export_filename,
+        export_media_type,
+        iter_export,
+    )
+
+    analysis_store = _get_store(app_request)
+
+    try:
+        check_export_dependencies(format, compression)
+    except RuntimeError as e:
+        logger.error(f"Error exporting analyses: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    await asyncio.to_thread(analysis_store.ensure_schema)
+
+    return StreamingResponse(
+        iter_export(analysis_store.engine, filters, format, compression, chunk_size),
+        media_type=export_media_type(format, compression),
+        headers={
+            "Content-Disposition": f'attachment; filename="{export_filename(format, compression)}"'
+        }
+    )
+
+@router.get("/analyses/{analysis_id}")
+async def get_analysis(analysis_id: int, app_request: Request):
+    """Отримання збереженого аналізу"""
+    analysis_store = _get_store(app_request)
+
+    analysis = await analysis_store.get(analysis_id)
+    if not analysis:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+
+    return analysis
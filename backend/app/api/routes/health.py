@@ -24,8 +24,11 @@ async def health_check(request: Request):
         if hasattr(request.app.state, 'twitter_scraper'):
             services_status["twitter_scraper"] = "available"
         
-        # Перевірка GPT service
-        if hasattr(request.app.state, 'gpt_service'):
+        # Перевірка GPT service (не створюємо його лише заради health check)
+        gpt_service = getattr(request.app.state, 'gpt_service', None)
+        if gpt_service is not None and not getattr(gpt_service, 'initialized', True):
+            services_status["gpt_service"] = "not_initialized"
+        elif gpt_service is not None:
             try:
                 is_connected = await request.app.state.gpt_service.test_connection()
                 services_status["gpt_service"] = "connected" if is_connected else "disconnected"
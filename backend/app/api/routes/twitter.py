@@ -3,14 +3,29 @@ Twitter Analysis Routes
 """
 
 from fastapi import APIRouter, Request, HTTPException
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, HttpUrl
-from typing import List, Dict, Any, Optional
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Dict, Any, Optional, Set, Tuple
+from datetime import datetime, timezone
+import asyncio
+import contextlib
+import hashlib
 import logging
 import time
+import orjson
 
-from app.services.twitter_scraper import TwitterPost
-from app.services.gpt_service import CommentRequest, CommentResponse
+from app.services.twitter_scraper import PostRecord, TwitterScraper
+from app.services.gpt_service import CommentRequest, CommentResponse, GPTService
+from app.services.thread_crawler import ConversationGraph, ThreadCrawler
+from app.utils.deadline import (
+    ClientDisconnected,
+    Deadline,
+    DeadlineExceeded,
+    current_deadline,
+    get_deadline,
+    run_until_disconnected,
+)
+from app.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -20,6 +35,13 @@ class AnalyzeRequest(BaseModel):
     twitter_url: HttpUrl
     comment_count: Optional[int] = 5
 
+class AnalyzeThreadRequest(BaseModel):
+    """Модель запиту для аналізу розмови (пост, відповіді, цитати)"""
+    twitter_url: HttpUrl
+    comment_count: Optional[int] = 5
+    max_depth: Optional[int] = Field(None, ge=0)
+    max_posts: Optional[int] = Field(None, ge=1)
+
 class AnalyzeResponse(BaseModel):
     """Модель відповіді з результатами аналізу"""
     post: Dict[str, Any]
@@ -28,81 +50,285 @@ class AnalyzeResponse(BaseModel):
     processing_time: float
     status: str
 
-@router.post("/analyze")
+async def _get_post(app_request: Request, twitter_scraper: TwitterScraper, url: str) -> PostRecord:
+    """Отримання посту через спільний кеш (один скрейп на весь кластер)"""
+    cache = getattr(app_request.app.state, 'cache', None)
+    status_id = twitter_scraper.extract_status_id(url)
+    
+    if cache is None or not status_id:
+        return PostRecord.from_model(await twitter_scraper.scrape_post(url))
+    
+    async def scrape() -> Dict[str, Any]:
+        post = await twitter_scraper.scrape_post(url)
+        return post.model_dump(mode="json")
+    
+    # Дані в кеші вже валідовані при скрейпінгу
+    post_data = await cache.get_or_compute(f"post:{status_id}", scrape)
+    return PostRecord.from_dict(post_data)
+
+async def _get_comments(
+    app_request: Request,
+    gpt_service: GPTService,
+    gpt_request: CommentRequest
+) -> Tuple[CommentResponse, bool]:
+    """Генерація коментарів через спільний кеш
+    
+    Повертає (відповідь, чи виконувалась генерація саме в цьому запиті).
+    """
+    cache = getattr(app_request.app.state, 'cache', None)
+    
+    if cache is None:
+        return await gpt_service.generate_comments(gpt_request), True
+    
+    generated = False
+    
+    async def generate() -> Dict[str, Any]:
+        nonlocal generated
+        comment_response = await gpt_service.generate_comments(gpt_request)
+        generated = True
+        return comment_response.model_dump(mode="json")
+    
+    request_hash = hashlib.sha256(gpt_request.model_dump_json().encode()).hexdigest()
+    comment_data = await cache.get_or_compute(f"gen:{request_hash}", generate)
+    return CommentResponse.model_construct(**comment_data), generated
+
+async def _describe_images(app_request: Request, images: List[str], reserve: float = 0.0) -> str:
+    """Опис зображень посту на основі локального аналізу
+    
+    reserve - час, який має залишитися до дедлайну для наступних етапів.
+    """
+    media_analyzer = getattr(app_request.app.state, 'media_analyzer', None)
+    fallback = f"Пост містить {len(images)} зображень"
+    
+    if media_analyzer is None:
+        return fallback
+    
+    timeout = None
+    deadline = get_deadline()
+    if deadline is not None:
+        timeout = deadline.remaining() - reserve
+        if timeout <= 0:
+            metrics.increment("deadline.skipped.media")
+            return fallback
+    
+    try:
+        return await asyncio.wait_for(media_analyzer.describe_images(images), timeout=timeout)
+    except asyncio.TimeoutError:
+        metrics.increment("deadline.timeouts.media")
+        logger.warning("Media analysis did not fit into the request deadline")
+    except Exception as e:
+        logger.error(f"Media analysis failed: {e}")
+    
+    return fallback
+
+async def _build_comment_request(
+    app_request: Request,
+    gpt_service: GPTService,
+    post: PostRecord,
+    comment_count: int
+) -> CommentRequest:
+    """Запит до GPT за даними посту (однаковий для /analyze та прогріву)"""
+    gpt_request = CommentRequest(
+        post_text=post.text,
+        author=post.author,
+        comment_count=comment_count,
+        engagement_stats=post.engagement()
+    )
+    
+    # Додавання інформації про медіа
+    if post.images:
+        gpt_request.images_description = await _describe_images(
+            app_request, post.images, reserve=gpt_service.expected_generation_time()
+        )
+    
+    if post.video_url:
+        gpt_request.video_description = "Пост містить відео"
+    
+    return gpt_request
+
+# Фонові задачі маршрутів (посилання тримаються до завершення)
+_background_tasks: Set[asyncio.Task] = set()
+
+def _record_analysis(app_request: Request, row: Dict[str, Any]):
+    """Передача результату у сховище без очікування на його створення"""
+    analysis_store = app_request.app.state.analysis_store
+    
+    if getattr(analysis_store, 'initialized', True):
+        analysis_store.record(row)
+        return
+    
+    # Сховище ще створюється (фоновий прогрів) - записуємо, щойно воно буде готове
+    row.setdefault("created_at", datetime.now(timezone.utc))
+    
+    async def record_later():
+        try:
+            store = await analysis_store.ainstance()
+            store.record(row)
+        except Exception as e:
+            logger.error(f"Failed to record analysis: {e}")
+            metrics.increment("store.dropped")
+    
+    task = asyncio.create_task(record_later())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+def _request_deadline(app_request: Request) -> Deadline:
+    """Дедлайн запиту: заголовок X-Request-Timeout або значення з налаштувань"""
+    settings = getattr(app_request.app.state, 'settings', None)
+    timeout = getattr(settings, 'request_timeout', 25.0)
+    max_timeout = getattr(settings, 'request_timeout_max', 120.0)
+    
+    header = app_request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            timeout = float(header)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid X-Request-Timeout header")
+        if timeout <= 0:
+            raise HTTPException(status_code=400, detail="X-Request-Timeout must be positive")
+    
+    return Deadline(min(timeout, max_timeout))
+
+async def _run_analysis(
+    request: AnalyzeRequest,
+    app_request: Request,
+    start_time: float,
+    progress: Dict[str, str]
+) -> ORJSONResponse:
+    """Конвеєр аналізу: скрейпінг, опис медіа, генерація, збереження"""
+    logger.info(f"Starting analysis of Twitter post: {request.twitter_url}")
+    
+    # Перевірка доступності сервісів
+    if not hasattr(app_request.app.state, 'twitter_scraper'):
+        raise HTTPException(status_code=500, detail="Twitter scraper not available")
+    
+    if not hasattr(app_request.app.state, 'gpt_service'):
+        raise HTTPException(status_code=500, detail="GPT service not available")
+    
+    # Парсинг Twitter-посту
+    progress["stage"] = "scrape"
+    twitter_scraper = app_request.app.state.twitter_scraper
+    prefetcher = getattr(app_request.app.state, 'prefetcher', None)
+    if prefetcher is not None:
+        prefetcher.consume(twitter_scraper.extract_status_id(str(request.twitter_url)))
+    post = await _get_post(app_request, twitter_scraper, str(request.twitter_url))
+    scrape_time = time.time() - start_time
+    
+    if not post:
+        raise HTTPException(status_code=400, detail="Failed to scrape Twitter post")
+    
+    # Підготовка даних для GPT (опис медіа - з запасом часу на генерацію)
+    gpt_service = app_request.app.state.gpt_service
+    if post.images:
+        progress["stage"] = "media"
+    gpt_request = await _build_comment_request(app_request, gpt_service, post, request.comment_count)
+    
+    # Генерація коментарів
+    progress["stage"] = "generation"
+    generation_start = time.time()
+    comment_response, generated = await _get_comments(app_request, gpt_service, gpt_request)
+    generation_time = time.time() - generation_start
+    progress["stage"] = "done"
+    
+    # Формування відповіді
+    processing_time = time.time() - start_time
+    
+    response_data = {
+        "post": post.public_dict(),
+        "comments": comment_response.comments,
+        "analysis": comment_response.analysis,
+        "processing_time": round(processing_time, 2),
+        "status": "success"
+    }
+    
+    logger.info(f"Analysis completed in {processing_time:.2f}s")
+    metrics.observe("analyze", processing_time)
+    
+    # Збереження результату (відкладений запис, не блокує відповідь)
+    if getattr(app_request.app.state, 'analysis_store', None) is not None:
+        # Токени - лише за генерацію, виконану цим запитом (кеш-хіт їх не витрачає)
+        usage = (comment_response.usage or {}) if generated else {}
+        _record_analysis(app_request, {
+            "status_id": twitter_scraper.extract_status_id(str(request.twitter_url)),
+            "url": post.url,
+            "author": post.author,
+            "status": "success",
+            "post": response_data["post"],
+            "comments": comment_response.comments,
+            "analysis": comment_response.analysis,
+            "processing_time": processing_time,
+            "scrape_time": scrape_time,
+            "generation_time": generation_time,
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "total_tokens": usage.get("total_tokens")
+        })
+    
+    # Відповідь серіалізується один раз (AnalyzeResponse - лише схема для документації)
+    return ORJSONResponse(response_data)
+
+@router.post("/analyze", response_model=AnalyzeResponse)
 async def analyze_twitter_post(request: AnalyzeRequest, app_request: Request):
-    """Аналіз Twitter-посту та генерація коментарів"""
+    """Аналіз Twitter-посту та генерація коментарів
+    
+    Обробка обмежена дедлайном запиту і скасовується, якщо клієнт від'єднався.
+    """
     start_time = time.time()
+    metrics.increment("analyze.requests")
+    progress = {"stage": "scrape"}
     
     try:
-        logger.info(f"Starting analysis of Twitter post: {request.twitter_url}")
-        
-        # Перевірка доступності сервісів
-        if not hasattr(app_request.app.state, 'twitter_scraper'):
-            raise HTTPException(status_code=500, detail="Twitter scraper not available")
-        
-        if not hasattr(app_request.app.state, 'gpt_service'):
-            raise HTTPException(status_code=500, detail="GPT service not available")
+        deadline_token = current_deadline.set(_request_deadline(app_request))
+    except HTTPException:
+        metrics.increment("analyze.errors")
+        raise
+    
+    prefetcher = getattr(app_request.app.state, 'prefetcher', None)
+    
+    try:
+        # Задача успадковує контекст з дедлайном; поки вона триває, прогрів стримується
+        with prefetcher.foreground() if prefetcher is not None else contextlib.nullcontext():
+            return await run_until_disconnected(
+                app_request, _run_analysis(request, app_request, start_time, progress)
+            )
         
-        # Парсинг Twitter-посту
-        twitter_scraper = app_request.app.state.twitter_scraper
-        post = await twitter_scraper.scrape_post(str(request.twitter_url))
+    except HTTPException:
+        metrics.increment("analyze.errors")
+        raise
+    except ClientDisconnected:
+        # Скасована робота: етап, на якому перервано, та незроблена генерація
+        metrics.increment("analyze.disconnected")
+        metrics.increment(f"deadline.cancelled.{progress['stage']}")
+        if progress["stage"] in ("scrape", "media"):
+            metrics.increment("deadline.saved_generations")
+        logger.info(f"Client disconnected during {progress['stage']}, analysis cancelled")
         
-        if not post:
-            raise HTTPException(status_code=400, detail="Failed to scrape Twitter post")
-        
-        # Підготовка даних для GPT
-        gpt_request = CommentRequest(
-            post_text=post.text,
-            author=post.author,
-            comment_count=request.comment_count,
-            engagement_stats={
-                "likes": post.likes_count,
-                "retweets": post.retweets_count,
-                "replies": post.replies_count
+        # 499: клієнт закрив з'єднання (відповідь уже ніхто не прочитає)
+        return JSONResponse(
+            status_code=499,
+            content={
+                "status": "cancelled",
+                "stage": progress["stage"],
+                "processing_time": round(time.time() - start_time, 2)
             }
         )
+    except DeadlineExceeded as e:
+        logger.warning(f"Analysis deadline exceeded during {progress['stage']}: {e}")
+        metrics.increment("analyze.errors")
+        metrics.increment("analyze.deadline_exceeded")
         
-        # Додавання інформації про медіа
-        if post.images:
-            gpt_request.images_description = f"Пост містить {len(post.images)} зображень"
-        
-        if post.video_url:
-            gpt_request.video_description = "Пост містить відео"
-        
-        # Генерація коментарів
-        gpt_service = app_request.app.state.gpt_service
-        comment_response = await gpt_service.generate_comments(gpt_request)
-        
-        # Формування відповіді
-        processing_time = time.time() - start_time
-        
-        response_data = {
-            "post": {
-                "url": str(post.url),
-                "text": post.text,
-                "author": post.author,
-                "images": post.images,
-                "video_url": post.video_url,
-                "engagement": {
-                    "likes": post.likes_count,
-                    "retweets": post.retweets_count,
-                    "replies": post.replies_count
-                }
-            },
-            "comments": comment_response.comments,
-            "analysis": comment_response.analysis,
-            "processing_time": round(processing_time, 2),
-            "status": "success"
-        }
-        
-        logger.info(f"Analysis completed in {processing_time:.2f}s")
-        
-        return AnalyzeResponse(**response_data)
-        
-    except HTTPException:
-        raise
+        return JSONResponse(
+            status_code=504,
+            content={
+                "status": "error",
+                "error": str(e),
+                "stage": progress["stage"],
+                "processing_time": round(time.time() - start_time, 2)
+            }
+        )
     except Exception as e:
         logger.error(f"Error analyzing Twitter post: {e}")
+        metrics.increment("analyze.errors")
         processing_time = time.time() - start_time
         
         return JSONResponse(
@@ -113,6 +339,83 @@ async def analyze_twitter_post(request: AnalyzeRequest, app_request: Request):
                 "processing_time": round(processing_time, 2)
             }
         )
+    finally:
+        current_deadline.reset(deadline_token)
+
+@router.post("/analyze-thread")
+async def analyze_twitter_thread(request: AnalyzeThreadRequest, app_request: Request):
+    """Аналіз розмови: NDJSON-потік вузлів у міру обходу, граф та коментарі
+    
+    Обхід іде лише за посиланнями, які віддає бекенд скрейпера. Syndication
+    (типовий перший бекенд) повідомляє тільки батьківський та цитований пост,
+    тому розмова збирається вгору по ланцюжку відповідей і цитат. Відповіді
+    на пост знаходяться лише тоді, коли їх містить HTML сторінки.
+    """
+    if not hasattr(app_request.app.state, 'twitter_scraper'):
+        raise HTTPException(status_code=500, detail="Twitter scraper not available")
+    
+    if not hasattr(app_request.app.state, 'gpt_service'):
+        raise HTTPException(status_code=500, detail="GPT service not available")
+    
+    twitter_scraper = app_request.app.state.twitter_scraper
+    gpt_service = app_request.app.state.gpt_service
+    url = str(request.twitter_url)
+    root_id = twitter_scraper.extract_status_id(url)
+    if not twitter_scraper.validate_twitter_url(url) or not root_id:
+        raise HTTPException(status_code=400, detail="Invalid Twitter URL format")
+    
+    # Ліміти запиту не перевищують налаштувань сервера
+    settings = getattr(app_request.app.state, 'settings', None)
+    max_depth = getattr(settings, 'thread_max_depth', 2)
+    max_posts = getattr(settings, 'thread_max_posts', 20)
+    crawler = ThreadCrawler(
+        lambda post_url: _get_post(app_request, twitter_scraper, post_url),
+        concurrency=getattr(settings, 'thread_concurrency', 4),
+        max_depth=min(request.max_depth, max_depth) if request.max_depth is not None else max_depth,
+        max_posts=min(request.max_posts, max_posts) if request.max_posts is not None else max_posts
+    )
+    
+    def event(data: Dict[str, Any]) -> bytes:
+        return orjson.dumps(data) + b"\n"
+    
+    async def events():
+        start_time = time.time()
+        metrics.increment("thread.requests")
+        graph = ConversationGraph(root_id)
+        
+        async for node in crawler.crawl(url, graph):
+            yield event({"type": "node", **node.to_dict()})
+        
+        yield event({"type": "graph", **graph.to_dict()})
+        
+        root = graph.nodes[root_id]
+        if root.post is None:
+            metrics.increment("thread.errors")
+            yield event({"type": "error", "status": "error", "error": root.error})
+            return
+        
+        # Одна генерація з контекстом усієї розмови
+        try:
+            gpt_request = await _build_comment_request(app_request, gpt_service, root.post, request.comment_count)
+            gpt_request.thread_context = graph.context() or None
+            comment_response, _ = await _get_comments(app_request, gpt_service, gpt_request)
+        except Exception as e:
+            logger.error(f"Error analyzing thread {root_id}: {e}")
+            metrics.increment("thread.errors")
+            yield event({"type": "error", "status": "error", "error": str(e)})
+            return
+        
+        processing_time = time.time() - start_time
+        metrics.observe("analyze_thread", processing_time)
+        yield event({
+            "type": "comments",
+            "comments": comment_response.comments,
+            "analysis": comment_response.analysis,
+            "processing_time": round(processing_time, 2),
+            "status": "success"
+        })
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 @router.get("/post/{post_id}")
 async def get_post_info(post_id: str, app_request: Request):
@@ -125,24 +428,12 @@ async def get_post_info(post_id: str, app_request: Request):
             raise HTTPException(status_code=500, detail="Twitter scraper not available")
         
         twitter_scraper = app_request.app.state.twitter_scraper
-        post = await twitter_scraper.scrape_post(twitter_url)
+        post = await _get_post(app_request, twitter_scraper, twitter_url)
         
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         
-        return {
-            "post_id": post_id,
-            "url": str(post.url),
-            "text": post.text,
-            "author": post.author,
-            "images": post.images,
-            "video_url": post.video_url,
-            "engagement": {
-                "likes": post.likes_count,
-                "retweets": post.retweets_count,
-                "replies": post.replies_count
-            }
-        }
+        return ORJSONResponse({"post_id": post_id, **post.public_dict()})
         
     except HTTPException:
         raise
@@ -150,19 +441,79 @@ async def get_post_info(post_id: str, app_request: Request):
         logger.error(f"Error getting post info: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _get_engagement_tracker(app_request: Request):
+    """Отримання сервісу відстеження статистики"""
+    if not hasattr(app_request.app.state, 'engagement_tracker'):
+        raise HTTPException(status_code=500, detail="Engagement tracker not available")
+    return app_request.app.state.engagement_tracker
+
+@router.get("/post/{post_id}/engagement")
+async def refresh_post_engagement(post_id: str, app_request: Request):
+    """Легке оновлення статистики посту (лише лічильники, умовний запит)"""
+    engagement_tracker = _get_engagement_tracker(app_request)
+    
+    try:
+        return await engagement_tracker.refresh(post_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error refreshing engagement for {post_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/post/{post_id}/engagement/history")
+async def get_post_engagement_history(post_id: str, app_request: Request):
+    """Часовий ряд лічильників посту"""
+    engagement_tracker = _get_engagement_tracker(app_request)
+    return await engagement_tracker.history(post_id)
+
+@router.post("/post/{post_id}/track")
+async def track_post(post_id: str, app_request: Request):
+    """Додавання посту до регулярного оновлення статистики"""
+    engagement_tracker = _get_engagement_tracker(app_request)
+    await engagement_tracker.track(post_id)
+    return {"post_id": post_id, "tracked": True, "status": "success"}
+
+@router.delete("/post/{post_id}/track")
+async def untrack_post(post_id: str, app_request: Request):
+    """Припинення регулярного оновлення статистики посту"""
+    engagement_tracker = _get_engagement_tracker(app_request)
+    await engagement_tracker.untrack(post_id)
+    return {"post_id": post_id, "tracked": False, "status": "success"}
+
+async def _prefetch(app_request: Request, url: str, comment_count: int):
+    """Спекулятивний прогрів: пост (і за налаштуванням - коментарі) у спільний кеш"""
+    twitter_scraper = app_request.app.state.twitter_scraper
+    post = await _get_post(app_request, twitter_scraper, url)
+    
+    settings = getattr(app_request.app.state, 'settings', None)
+    if getattr(settings, 'prefetch_generation', False):
+        gpt_service = app_request.app.state.gpt_service
+        gpt_request = await _build_comment_request(app_request, gpt_service, post, comment_count)
+        await _get_comments(app_request, gpt_service, gpt_request)
+
 @router.post("/validate-url")
 async def validate_twitter_url(request: AnalyzeRequest, app_request: Request):
-    """Валідація Twitter URL"""
+    """Валідація Twitter URL (валідний URL запускає фоновий прогрів для /analyze)"""
     try:
         if not hasattr(app_request.app.state, 'twitter_scraper'):
             raise HTTPException(status_code=500, detail="Twitter scraper not available")
         
         twitter_scraper = app_request.app.state.twitter_scraper
-        is_valid = twitter_scraper.validate_twitter_url(str(request.twitter_url))
+        url = str(request.twitter_url)
+        is_valid = twitter_scraper.validate_twitter_url(url)
+        
+        prefetching = False
+        prefetcher = getattr(app_request.app.state, 'prefetcher', None)
+        if is_valid and prefetcher is not None:
+            prefetching = prefetcher.schedule(
+                twitter_scraper.extract_status_id(url),
+                lambda: _prefetch(app_request, url, request.comment_count)
+            )
         
         return {
-            "url": str(request.twitter_url),
+            "url": url,
             "is_valid": is_valid,
+            "prefetching": prefetching,
             "status": "success"
         }
         
@@ -177,12 +528,32 @@ async def validate_twitter_url(request: AnalyzeRequest, app_request: Request):
         )
 
 @router.get("/metrics")
-async def get_metrics():
-    """Отримання метрик сервера"""
+async def get_metrics(app_request: Request):
+    """Отримання метрик сервера (в межах поточного воркера)"""
+    snapshot = metrics.snapshot()
+    requests_total = int(snapshot["counters"].get("analyze.requests", 0))
+    errors_total = int(snapshot["counters"].get("analyze.errors", 0))
+    analyze_timing = snapshot["timings"].get("analyze", {})
+    
+    twitter_scraper = getattr(app_request.app.state, 'twitter_scraper', None)
+    scraper_ready = twitter_scraper is not None and getattr(twitter_scraper, 'initialized', True)
+    endpoints = twitter_scraper.fetcher.snapshot() if scraper_ready else {}
+    scraper_backends = (
+        {name: stats.snapshot() for name, stats in twitter_scraper.backend_stats.items()}
+        if scraper_ready else {}
+    )
+    
+    prefetcher = getattr(app_request.app.state, 'prefetcher', None)
+    
     return {
-        "requests_total": 0,  # TODO: Implement metrics collection
-        "requests_per_minute": 0,
-        "average_response_time": 0,
-        "error_rate": 0,
-        "uptime": time.time()
+        "requests_total": requests_total,
+        "requests_per_minute": round(requests_total / max(snapshot["uptime"], 1) * 60, 2),
+        "average_response_time": round(analyze_timing.get("average", 0) * 1000),
+        "error_rate": round(errors_total / requests_total * 100, 2) if requests_total else 0,
+        "uptime": snapshot["uptime"],
+        "counters": snapshot["counters"],
+        "timings": snapshot["timings"],
+        "endpoints": endpoints,
+        "scraper_backends": scraper_backends,
+        "prefetch": await prefetcher.snapshot() if prefetcher is not None else {}
     }
@@ -0,0 +1,235 @@
+"""
+Analysis Export - Потоковий експорт збережених аналізів з постійним споживанням пам'яті
+"""
+
+import logging
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+import orjson
+
+from app.services.analysis_filter import AnalysisFilter
+from app.services.analysis_store import AnalysisRecord, AnalysisStore
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": {"media_type": "application/x-ndjson", "extension": "ndjson"},
+    "arrow": {"media_type": "application/vnd.apache.arrow.stream", "extension": "arrows"},
+    "parquet": {"media_type": "application/vnd.apache.parquet", "extension": "parquet"},
+}
+
+EXPORT_COMPRESSIONS = {
+    None: {"media_type": None, "extension": ""},
+    "gzip": {"media_type": "application/gzip", "extension": ".gz"},
+    "zstd": {"media_type": "application/zstd", "extension": ".zst"},
+}
+
+# Колонки з вкладеними структурами зберігаються як JSON-рядки у колонкових форматах
+JSON_COLUMNS = ("post", "comments", "analysis")
+
+
+class _ChunkSink:
+    """Файлоподібний приймач, з якого записані байти забираються після кожного чанку"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def readable(self) -> bool:
+        return False
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _create_compressor(compression: Optional[str]):
+    """Створення потокового компресора"""
+    if compression is None:
+        return None
+    if compression == "gzip":
+        return zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    raise ValueError(f"Unsupported compression: {compression}")
+
+
+def check_export_dependencies(fmt: str, compression: Optional[str]):
+    """Імпорт залежностей формату до початку потоку
+
+    Помилка імпорту всередині генератора обірвала б уже розпочату відповідь 200.
+    """
+    try:
+        if fmt in ("arrow", "parquet"):
+            import pyarrow  # noqa: F401
+        if fmt == "parquet":
+            import pyarrow.parquet  # noqa: F401
+        if compression == "zstd" and fmt != "parquet":
+            import zstandard  # noqa: F401
+    except (ImportError, AttributeError) as e:
+        # AttributeError: бінарна несумісність pyarrow з версією numpy
+        raise RuntimeError(f"Export format {fmt} is unavailable: {e}") from e
+
+
+def export_filename(fmt: str, compression: Optional[str]) -> str:
+    """Ім'я файлу експорту"""
+    extension = EXPORT_FORMATS[fmt]["extension"]
+    if fmt != "parquet":
+        extension += EXPORT_COMPRESSIONS[compression]["extension"]
+    return f"analyses.{extension}"
+
+
+def export_media_type(fmt: str, compression: Optional[str]) -> str:
+    """MIME-тип експорту"""
+    if fmt != "parquet" and compression:
+        return EXPORT_COMPRESSIONS[compression]["media_type"]
+    return EXPORT_FORMATS[fmt]["media_type"]
+
+
+def select_for_export(filters: AnalysisFilter):
+    """Запит лише по колонках таблиці (без ORM-об'єктів)"""
+    query = AnalysisStore.build_query(filters)
+    return query.with_only_columns(*AnalysisRecord.__table__.columns)
+
+
+def _iter_row_chunks(engine, filters: AnalysisFilter, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Читання рядків чанками через серверний курсор"""
+    store_query = select_for_export(filters).order_by(AnalysisRecord.created_at, AnalysisRecord.id)
+
+    with engine.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True,
+            yield_per=chunk_size,
+        ).execute(store_query)
+
+        for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
+
+
+def _ndjson_chunks(rows: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for chunk in rows:
+        yield b"".join(orjson.dumps(row) + b"\n" for row in chunk)
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("id", pa.int64()),
+        ("status_id", pa.string()),
+        ("url", pa.string()),
+        ("author", pa.string()),
+        ("status", pa.string()),
+        ("post", pa.string()),
+        ("comments", pa.string()),
+        ("analysis", pa.string()),
+        ("processing_time", pa.float64()),
+        ("scrape_time", pa.float64()),
+        ("generation_time", pa.float64()),
+        ("prompt_tokens", pa.int64()),
+        ("completion_tokens", pa.int64()),
+        ("total_tokens", pa.int64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _to_record_batch(chunk: List[Dict[str, Any]], schema):
+    import pyarrow as pa
+
+    for row in chunk:
+        for column in JSON_COLUMNS:
+            row[column] = orjson.dumps(row[column]).decode()
+    return pa.RecordBatch.from_pylist(chunk, schema=schema)
+
+
+def _columnar_chunks(
+    rows: Iterator[List[Dict[str, Any]]],
+    fmt: str,
+    compression: Optional[str],
+) -> Iterator[bytes]:
+    import pyarrow as pa
+
+    schema = _arrow_schema()
+    sink = _ChunkSink()
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(sink, schema, compression=compression or "none")
+        write = writer.write_batch
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+        write = writer.write_batch
+
+    try:
+        for chunk in rows:
+            # Кожен чанк - окрема row group / record batch
+            write(_to_record_batch(chunk, schema))
+            data = sink.take()
+            if data:
+                yield data
+    finally:
+        writer.close()
+
+    data = sink.take()
+    if data:
+        yield data
+
+
+def iter_export(
+    engine,
+    filters: AnalysisFilter,
+    fmt: str = "ndjson",
+    compression: Optional[str] = None,
+    chunk_size: int = 1000,
+) -> Iterator[bytes]:
+    """Потоковий експорт аналізів: пам'ять обмежена розміром одного чанку"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+
+    rows = _iter_row_chunks(engine, filters, chunk_size)
+
+    if fmt == "ndjson":
+        chunks = _ndjson_chunks(rows)
+    else:
+        chunks = _columnar_chunks(rows, fmt, compression if fmt == "parquet" else None)
+
+    # Parquet стискається власним кодеком по колонках
+    compressor = _create_compressor(compression) if fmt != "parquet" else None
+    if compressor is None:
+        yield from chunks
+        return
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
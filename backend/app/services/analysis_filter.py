@@ -0,0 +1,30 @@
+"""
+Analysis Filter - Фільтри історії аналізів (без залежності від SQLAlchemy)
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class AnalysisFilter(BaseModel):
+    """Фільтри для історії та експорту аналізів"""
+    status_id: Optional[str] = None
+    author: Optional[str] = None
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    status: Optional[str] = None
+    sentiment: Optional[str] = None
+    min_processing_time: Optional[float] = None
+    max_processing_time: Optional[float] = None
+
+
+def as_utc(value: datetime) -> datetime:
+    """Приведення до UTC (наївний час вважається UTC)
+
+    SQLite зберігає час без зміщення, тому межі фільтра порівнюються лише в UTC.
+    """
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
@@ -0,0 +1,291 @@
+"""
+Analysis Store - Збереження результатів аналізу з відкладеним записом (write-behind)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import (
+    JSON, BigInteger, DateTime, Float, Index, Integer, String, Text,
+    create_engine, insert, select,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.services.analysis_filter import AnalysisFilter, as_utc
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class AnalysisRecord(Base):
+    """Збережений результат аналізу посту"""
+    __tablename__ = "analyses"
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), primary_key=True, autoincrement=True
+    )
+    status_id: Mapped[Optional[str]] = mapped_column(String(32))
+    url: Mapped[str] = mapped_column(Text)
+    author: Mapped[str] = mapped_column(String(64), default="")
+    status: Mapped[str] = mapped_column(String(16), default="success")
+
+    post: Mapped[Dict[str, Any]] = mapped_column(JSONType)
+    comments: Mapped[List[str]] = mapped_column(JSONType)
+    analysis: Mapped[Dict[str, Any]] = mapped_column(JSONType)
+
+    processing_time: Mapped[float] = mapped_column(Float)
+    scrape_time: Mapped[Optional[float]] = mapped_column(Float)
+    generation_time: Mapped[Optional[float]] = mapped_column(Float)
+
+    prompt_tokens: Mapped[Optional[int]] = mapped_column(Integer)
+    completion_tokens: Mapped[Optional[int]] = mapped_column(Integer)
+    total_tokens: Mapped[Optional[int]] = mapped_column(Integer)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    __table_args__ = (
+        Index("ix_analyses_status_id_created_at", "status_id", "created_at"),
+        Index("ix_analyses_author_created_at", "author", "created_at"),
+        Index("ix_analyses_created_at", "created_at"),
+    )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status_id": self.status_id,
+            "url": self.url,
+            "author": self.author,
+            "status": self.status,
+            "post": self.post,
+            "comments": self.comments,
+            "analysis": self.analysis,
+            "processing_time": self.processing_time,
+            "timings": {
+                "scrape": self.scrape_time,
+                "generation": self.generation_time,
+            },
+            "token_usage": {
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "total_tokens": self.total_tokens,
+            },
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
+
+
+def create_db_engine(database_url: str, pool_size: int = 10, max_overflow: int = 20):
+    """Створення SQLAlchemy engine для SQLite (локально) або Postgres (продакшн)"""
+    url = make_url(database_url)
+
+    if url.get_backend_name() == "sqlite":
+        if url.database and url.database != ":memory:":
+            Path(url.database).parent.mkdir(parents=True, exist_ok=True)
+        return create_engine(url, connect_args={"check_same_thread": False})
+
+    return create_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_pre_ping=True,
+    )
+
+
+class AnalysisStore:
+    """Сховище аналізів: запис через буфер пакетами поза шляхом запиту"""
+
+    def __init__(
+        self,
+        engine,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        max_buffer: int = 10000,
+        retry_attempts: int = 5,
+        retry_backoff: float = 0.5,
+        retry_backoff_max: float = 10.0,
+    ):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_attempts = retry_attempts
+        self.retry_backoff = retry_backoff
+        self.retry_backoff_max = retry_backoff_max
+        self._buffer: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def ensure_schema(self):
+        """Створення таблиць при першому зверненні до бази (блокуючий виклик)"""
+        with self._schema_lock:
+            if not self._schema_ready:
+                Base.metadata.create_all(self.engine)
+                self._schema_ready = True
+
+    def start(self):
+        """Запуск фонового запису (викликається автоматично при першому записі)"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            logger.info(f"Analysis store started ({self.engine.url.get_backend_name()})")
+
+    async def stop(self):
+        """Зупинка фонового запису із записом залишку буфера"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+        # Пакет, що записувався в момент зупинки, дописується до кінця
+        if self._flushing is not None:
+            await self._flushing
+
+        while not self._buffer.empty():
+            await self._flush(self._drain())
+
+        await asyncio.to_thread(self.engine.dispose)
+
+    def record(self, row: Dict[str, Any]):
+        """Додавання результату в буфер (не блокує запит)"""
+        row.setdefault("created_at", datetime.now(timezone.utc))
+        self.start()
+        try:
+            self._buffer.put_nowait(row)
+            metrics.increment("store.buffered")
+        except asyncio.QueueFull:
+            logger.warning("Analysis store buffer is full, dropping record")
+            metrics.increment("store.dropped")
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size and not self._buffer.empty():
+            batch.append(self._buffer.get_nowait())
+        return batch
+
+    async def _flush_loop(self):
+        while True:
+            # Чекаємо перший запис, потім добираємо пакет
+            batch = [await self._buffer.get()]
+            deadline = time.monotonic() + self.flush_interval
+
+            try:
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._buffer.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Не втрачаємо вже зібраний пакет при зупинці
+                await self._flush(batch)
+                raise
+
+            self._flushing = asyncio.ensure_future(self._flush(batch))
+            try:
+                await asyncio.shield(self._flushing)
+            finally:
+                if self._flushing.done():
+                    self._flushing = None
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        if not batch:
+            return
+
+        # Тимчасові помилки бази (або гонка create_all між воркерами) - повтор з backoff
+        for attempt in range(self.retry_attempts):
+            start_time = time.time()
+            try:
+                await asyncio.to_thread(self._insert_batch, batch)
+                metrics.increment("store.flushed", len(batch))
+                metrics.observe("store.flush", time.time() - start_time)
+                return
+            except Exception as e:
+                if attempt + 1 >= self.retry_attempts:
+                    logger.error(f"Failed to persist {len(batch)} analyses after {self.retry_attempts} attempts: {e}")
+                    metrics.increment("store.failed", len(batch))
+                    return
+
+                delay = min(self.retry_backoff_max, self.retry_backoff * 2 ** attempt)
+                logger.warning(
+                    f"Failed to persist {len(batch)} analyses "
+                    f"(attempt {attempt + 1}/{self.retry_attempts}), retrying in {delay:.1f}s: {e}"
+                )
+                metrics.increment("store.retries")
+                await asyncio.sleep(delay)
+
+    def _insert_batch(self, batch: List[Dict[str, Any]]):
+        self.ensure_schema()
+        with Session(self.engine) as session:
+            session.execute(insert(AnalysisRecord), batch)
+            session.commit()
+
+    @staticmethod
+    def build_query(filters: AnalysisFilter):
+        """Побудова запиту з фільтрами (основні поля покриті індексами)"""
+        query = select(AnalysisRecord)
+
+        if filters.status_id:
+            query = query.where(AnalysisRecord.status_id == filters.status_id)
+        if filters.author:
+            query = query.where(AnalysisRecord.author == filters.author)
+        if filters.since:
+            query = query.where(AnalysisRecord.created_at >= as_utc(filters.since))
+        if filters.until:
+            query = query.where(AnalysisRecord.created_at < as_utc(filters.until))
+        if filters.status:
+            query = query.where(AnalysisRecord.status == filters.status)
+        if filters.sentiment:
+            query = query.where(AnalysisRecord.analysis["sentiment"].as_string() == filters.sentiment)
+        if filters.min_processing_time is not None:
+            query = query.where(AnalysisRecord.processing_time >= filters.min_processing_time)
+        if filters.max_processing_time is not None:
+            query = query.where(AnalysisRecord.processing_time <= filters.max_processing_time)
+
+        return query
+
+    async def query(
+        self,
+        filters: AnalysisFilter,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """Історія аналізів (від нових до старих)"""
+        query = (
+            self.build_query(filters)
+            .order_by(AnalysisRecord.created_at.desc(), AnalysisRecord.id.desc())
+            .limit(limit)
+            .offset(offset)
+        )
+
+        def _query():
+            self.ensure_schema()
+            with Session(self.engine) as session:
+                return [record.to_dict() for record in session.scalars(query)]
+
+        return await asyncio.to_thread(_query)
+
+    async def get(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        """Отримання одного аналізу за ID"""
+        def _get():
+            self.ensure_schema()
+            with Session(self.engine) as session:
+                record = session.get(AnalysisRecord, analysis_id)
+                return record.to_dict() if record else None
+
+        return await asyncio.to_thread(_get)
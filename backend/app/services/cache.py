@@ -0,0 +1,469 @@
+"""
+Cache Service - Дворівневий кеш (локальний LRU + спільний між воркерами)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import msgpack
+
+from app.utils.deadline import DeadlineExceeded, get_deadline, shrink_timeout
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def pack(value: Any) -> bytes:
+    """Компактна бінарна серіалізація значення"""
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """Десеріалізація значення"""
+    return msgpack.unpackb(data, raw=False)
+
+
+class LocalLRUCache:
+    """Локальний LRU кеш в межах одного воркера"""
+
+    def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
+        self._items: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+
+        expires_at, value = item
+        if expires_at < time.time():
+            del self._items[key]
+            return None
+
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int):
+        self._items[key] = (time.time() + ttl, value)
+        self._items.move_to_end(key)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def delete(self, key: str):
+        self._items.pop(key, None)
+
+
+class RedisCacheBackend:
+    """Спільний рівень кешу на базі Redis"""
+
+    name = "redis"
+
+    # Звільнення блокування лише його власником
+    _RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+    def __init__(self, url: str, prefix: str = "twitter-analyzer:"):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url)
+        self.prefix = prefix
+
+    async def ping(self) -> bool:
+        return bool(await self.client.ping())
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.prefix + key)
+
+    async def set(self, key: str, data: bytes, ttl: int):
+        await self.client.set(self.prefix + key, data, ex=ttl)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+    async def increment(self, key: str, increments: Dict[str, float], ttl: int) -> Dict[str, float]:
+        counters_key = self.prefix + "counters:" + key
+        async with self.client.pipeline(transaction=True) as pipe:
+            for field, amount in increments.items():
+                pipe.hincrbyfloat(counters_key, field, amount)
+            pipe.expire(counters_key, ttl)
+            pipe.hgetall(counters_key)
+            results = await pipe.execute()
+        return {field.decode(): float(value) for field, value in results[-1].items()}
+
+    async def counters(self, key: str) -> Dict[str, float]:
+        values = await self.client.hgetall(self.prefix + "counters:" + key)
+        return {field.decode(): float(value) for field, value in values.items()}
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        return bool(await self.client.set(
+            self.prefix + "lock:" + key, token, nx=True, px=int(ttl * 1000)
+        ))
+
+    async def release_lock(self, key: str, token: str):
+        await self.client.eval(self._RELEASE_SCRIPT, 1, self.prefix + "lock:" + key, token)
+
+    async def close(self):
+        await self.client.close()
+
+
+class SQLiteCacheBackend:
+    """Спільний рівень кешу на базі SQLite (fallback без Redis)"""
+
+    name = "sqlite"
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str = "data/cache.sqlite3"):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS locks (key TEXT PRIMARY KEY, token TEXT, expires_at REAL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS counters "
+            "(key TEXT, field TEXT, value REAL, expires_at REAL, PRIMARY KEY (key, field))"
+        )
+
+    def _execute(self, sql: str, params: tuple = ()) -> Tuple[Optional[tuple], int]:
+        """Виконання запиту: повертає перший рядок та кількість змінених рядків"""
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            return cursor.fetchone(), cursor.rowcount
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str) -> Optional[bytes]:
+        def _get():
+            row, _ = self._execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            )
+            return row[0] if row else None
+
+        return await asyncio.to_thread(_get)
+
+    async def set(self, key: str, data: bytes, ttl: int):
+        def _set():
+            now = time.time()
+            self._execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, data, now + ttl),
+            )
+            # Періодичне очищення застарілих записів
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                self._execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+
+        await asyncio.to_thread(_set)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._execute, "DELETE FROM cache WHERE key = ?", (key,))
+
+    async def increment(self, key: str, increments: Dict[str, float], ttl: int) -> Dict[str, float]:
+        def _increment():
+            now = time.time()
+            with self._lock:
+                # Одна транзакція: інкремент і читання атомарні й між процесами
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    self._conn.execute("DELETE FROM counters WHERE key = ? AND expires_at <= ?", (key, now))
+                    for field, amount in increments.items():
+                        self._conn.execute(
+                            "INSERT INTO counters (key, field, value, expires_at) VALUES (?, ?, ?, ?) "
+                            "ON CONFLICT (key, field) DO UPDATE SET value = value + excluded.value",
+                            (key, field, amount, now + ttl),
+                        )
+                    self._conn.execute("UPDATE counters SET expires_at = ? WHERE key = ?", (now + ttl, key))
+                    rows = self._conn.execute(
+                        "SELECT field, value FROM counters WHERE key = ?", (key,)
+                    ).fetchall()
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            return dict(rows)
+
+        return await asyncio.to_thread(_increment)
+
+    async def counters(self, key: str) -> Dict[str, float]:
+        def _counters():
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT field, value FROM counters WHERE key = ? AND expires_at > ?", (key, time.time())
+                ).fetchall()
+            return dict(rows)
+
+        return await asyncio.to_thread(_counters)
+
+    async def acquire_lock(self, key: str, token: str, ttl: float) -> bool:
+        def _acquire():
+            now = time.time()
+            self._execute("DELETE FROM locks WHERE key = ? AND expires_at <= ?", (key, now))
+            _, inserted = self._execute(
+                "INSERT OR IGNORE INTO locks (key, token, expires_at) VALUES (?, ?, ?)",
+                (key, token, now + ttl),
+            )
+            return inserted == 1
+
+        return await asyncio.to_thread(_acquire)
+
+    async def release_lock(self, key: str, token: str):
+        await asyncio.to_thread(
+            self._execute, "DELETE FROM locks WHERE key = ? AND token = ?", (key, token)
+        )
+
+    async def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SharedCache:
+    """Дворівневий кеш з дедуплікацією обчислень між воркерами"""
+
+    def __init__(
+        self,
+        backend,
+        default_ttl: int = 3600,
+        local_max_size: int = 1000,
+        local_ttl: int = 60,
+        lock_ttl: float = 60.0,
+        poll_interval: float = 0.1,
+    ):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.local_ttl = local_ttl
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.local = LocalLRUCache(max_size=local_max_size)
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    @classmethod
+    async def create(
+        cls,
+        redis_url: Optional[str] = None,
+        sqlite_path: str = "data/cache.sqlite3",
+        **kwargs,
+    ) -> "SharedCache":
+        """Створення кешу: Redis, якщо доступний, інакше SQLite"""
+        if redis_url:
+            try:
+                backend = RedisCacheBackend(redis_url)
+                await backend.ping()
+                logger.info(f"Shared cache backend: redis ({redis_url})")
+                return cls(backend, **kwargs)
+            except Exception as e:
+                logger.warning(f"Redis unavailable, falling back to SQLite cache: {e}")
+
+        logger.info(f"Shared cache backend: sqlite ({sqlite_path})")
+        return cls(SQLiteCacheBackend(sqlite_path), **kwargs)
+
+    async def get(self, key: str, use_local: bool = True) -> Optional[Any]:
+        """Пошук значення: спочатку локальний LRU, потім спільний рівень"""
+        if use_local:
+            value = self.local.get(key)
+            if value is not None:
+                metrics.increment("cache.local_hits")
+                return value
+
+        try:
+            data = await self.backend.get(key)
+        except Exception as e:
+            logger.error(f"Shared cache get failed for {key}: {e}")
+            data = None
+
+        if data is None:
+            metrics.increment("cache.misses")
+            return None
+
+        metrics.increment("cache.shared_hits")
+        value = unpack(data)
+        self.local.set(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Запис значення в обидва рівні кешу"""
+        ttl = ttl or self.default_ttl
+        self.local.set(key, value, min(ttl, self.local_ttl))
+
+        try:
+            await self.backend.set(key, pack(value), ttl)
+        except Exception as e:
+            logger.error(f"Shared cache set failed for {key}: {e}")
+
+    async def delete(self, key: str):
+        """Видалення значення з обох рівнів кешу"""
+        self.local.delete(key)
+        try:
+            await self.backend.delete(key)
+        except Exception as e:
+            logger.error(f"Shared cache delete failed for {key}: {e}")
+
+    async def increment(
+        self,
+        key: str,
+        increments: Dict[str, float],
+        ttl: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """Атомарний інкремент лічильників ключа без блокування; повертає всі лічильники"""
+        try:
+            return await self.backend.increment(key, increments, ttl or self.default_ttl)
+        except Exception as e:
+            logger.error(f"Shared cache increment failed for {key}: {e}")
+            return {}
+
+    async def counters(self, key: str) -> Dict[str, float]:
+        """Поточні значення лічильників ключа"""
+        try:
+            return await self.backend.counters(key)
+        except Exception as e:
+            logger.error(f"Shared cache counters failed for {key}: {e}")
+            return {}
+
+    async def get_or_compute(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None,
+    ) -> Any:
+        """Отримання значення з кешу або одноразове обчислення на весь кластер"""
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        # Дедуплікація в межах воркера (очікування обмежене дедлайном запиту)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            metrics.increment("cache.inflight_joins")
+            waiter = asyncio.shield(inflight)
+            deadline = get_deadline()
+            try:
+                done, _ = await asyncio.wait({waiter}, timeout=deadline.remaining() if deadline else None)
+                if not done:
+                    metrics.increment("deadline.skipped.cache_wait")
+                    raise DeadlineExceeded(f"Request deadline exceeded waiting for {key}")
+                return waiter.result()
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # Запит-ініціатор скасовано - обчислюємо самостійно
+                return await self.get_or_compute(key, factory, ttl)
+            except DeadlineExceeded:
+                if inflight.done() and (deadline is None or not deadline.expired):
+                    # Вичерпано дедлайн ініціатора, а не наш - обчислюємо самостійно
+                    return await self.get_or_compute(key, factory, ttl)
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute_once(key, factory, ttl)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Позначаємо виняток як отриманий, якщо ніхто не чекає
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _compute_once(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+    ) -> Any:
+        """Обчислення під міжворкерним блокуванням"""
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_ttl
+
+        while True:
+            try:
+                acquired = await self.backend.acquire_lock(key, token, self.lock_ttl)
+            except Exception as e:
+                logger.error(f"Shared cache lock failed for {key}: {e}")
+                acquired = True
+
+            if acquired:
+                try:
+                    # Інший воркер міг завершити обчислення, поки ми чекали
+                    value = await self.get(key)
+                    if value is not None:
+                        return value
+
+                    metrics.increment("cache.computations")
+                    value = await factory()
+                    await self.set(key, value, ttl)
+                    return value
+                finally:
+                    try:
+                        await self.backend.release_lock(key, token)
+                    except Exception as e:
+                        logger.error(f"Shared cache unlock failed for {key}: {e}")
+
+            # Чекаємо результат від воркера, що тримає блокування, але не довше дедлайну запиту
+            metrics.increment("cache.lock_waits")
+            await asyncio.sleep(shrink_timeout(self.poll_interval, "cache_wait"))
+
+            value = await self.get(key)
+            if value is not None:
+                return value
+
+            if time.monotonic() > deadline:
+                logger.warning(f"Timed out waiting for shared computation of {key}")
+                metrics.increment("cache.computations")
+                value = await factory()
+                await self.set(key, value, ttl)
+                return value
+
+    @asynccontextmanager
+    async def locked(self, key: str, ttl: float = 10.0):
+        """Міжворкерне блокування для read-modify-write операцій"""
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + ttl
+
+        while not await self.backend.acquire_lock(key, token, ttl):
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Could not acquire lock for {key}")
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            yield
+        finally:
+            await self.backend.release_lock(key, token)
+
+    async def try_lock(self, key: str, ttl: float) -> bool:
+        """Неблокуюча спроба зайняти ключ на ttl секунд (без звільнення)"""
+        try:
+            return await self.backend.acquire_lock(key, uuid.uuid4().hex, ttl)
+        except Exception as e:
+            logger.error(f"Shared cache lock failed for {key}: {e}")
+            return False
+
+    async def close(self):
+        await self.backend.close()
@@ -0,0 +1,264 @@
+"""
+Engagement Tracker - Легке оновлення статистики постів та компактні часові ряди
+"""
+
+import asyncio
+import logging
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+from app.services.cache import SharedCache
+from app.services.twitter_scraper import TwitterScraper
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+STAT_FIELDS = ("likes", "retweets", "replies")
+
+# Невідоме значення лічильника у часовому ряді
+UNKNOWN = -1
+
+
+class EngagementSeries:
+    """Часовий ряд лічильників посту (зберігаються лише зміни)"""
+
+    __slots__ = ("timestamps", "likes", "retweets", "replies", "etag", "last_modified", "last_checked")
+
+    def __init__(self):
+        self.timestamps = array("d")
+        self.likes = array("q")
+        self.retweets = array("q")
+        self.replies = array("q")
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.last_checked: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def sample(self, index: int) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamps[index],
+            **{
+                field: None if getattr(self, field)[index] == UNKNOWN else getattr(self, field)[index]
+                for field in STAT_FIELDS
+            },
+        }
+
+    def append(self, timestamp: float, stats: Dict[str, Optional[int]], max_samples: int) -> bool:
+        """Додавання виміру; повертає True, якщо лічильники змінились"""
+        values = [UNKNOWN if stats.get(field) is None else stats[field] for field in STAT_FIELDS]
+
+        if len(self) and values == [getattr(self, field)[-1] for field in STAT_FIELDS]:
+            return False
+
+        self.timestamps.append(timestamp)
+        for field, value in zip(STAT_FIELDS, values):
+            getattr(self, field).append(value)
+
+        # Обмеження довжини ряду
+        if len(self) > max_samples:
+            for field in ("timestamps",) + STAT_FIELDS:
+                del getattr(self, field)[: len(self) - max_samples]
+
+        return True
+
+    def delta(self) -> Dict[str, Optional[int]]:
+        """Зміна лічильників відносно попереднього виміру"""
+        if len(self) < 2:
+            return {field: None for field in STAT_FIELDS}
+
+        result = {}
+        for field in STAT_FIELDS:
+            previous, current = getattr(self, field)[-2], getattr(self, field)[-1]
+            result[field] = None if UNKNOWN in (previous, current) else current - previous
+        return result
+
+    def to_cache(self) -> Dict[str, Any]:
+        """Компактне представлення (сирі байти масивів) для спільного кешу"""
+        return {
+            "t": self.timestamps.tobytes(),
+            "l": self.likes.tobytes(),
+            "rt": self.retweets.tobytes(),
+            "rp": self.replies.tobytes(),
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "last_checked": self.last_checked,
+        }
+
+    @classmethod
+    def from_cache(cls, data: Optional[Dict[str, Any]]) -> "EngagementSeries":
+        series = cls()
+        if not data:
+            return series
+
+        series.timestamps.frombytes(data["t"])
+        series.likes.frombytes(data["l"])
+        series.retweets.frombytes(data["rt"])
+        series.replies.frombytes(data["rp"])
+        series.etag = data.get("etag")
+        series.last_modified = data.get("last_modified")
+        series.last_checked = data.get("last_checked")
+        return series
+
+
+class EngagementTracker:
+    """Оновлення статистики відстежуваних постів з обмеженою паралельністю"""
+
+    TRACKED_KEY = "engagement:tracked"
+
+    def __init__(
+        self,
+        scraper: TwitterScraper,
+        cache: SharedCache,
+        concurrency: int = 8,
+        interval: float = 300.0,
+        history_ttl: int = 7 * 24 * 3600,
+        max_samples: int = 2000,
+    ):
+        self.scraper = scraper
+        self.cache = cache
+        self.concurrency = concurrency
+        self.interval = interval
+        self.history_ttl = history_ttl
+        self.max_samples = max_samples
+        self._scheduler_task: Optional[asyncio.Task] = None
+
+    def _series_key(self, status_id: str) -> str:
+        return f"engagement:{status_id}"
+
+    async def _load(self, status_id: str) -> EngagementSeries:
+        data = await self.cache.get(self._series_key(status_id), use_local=False)
+        return EngagementSeries.from_cache(data)
+
+    async def refresh(self, status_id: str) -> Dict[str, Any]:
+        """Оновлення лічильників одного посту"""
+        url = f"https://twitter.com/i/status/{status_id}"
+        series = await self._load(status_id)
+
+        stats, validators = await self.scraper.fetch_engagement(
+            url, etag=series.etag, last_modified=series.last_modified
+        )
+        now = time.time()
+        metrics.increment("engagement.refreshes")
+
+        # Сторінка без лічильників (рендериться JS) - це відсутність даних, а не нулі
+        empty = stats is not None and all(stats.get(field) is None for field in STAT_FIELDS)
+        if empty:
+            metrics.increment("engagement.empty")
+            stats = None
+
+        async with self.cache.locked(self._series_key(status_id)):
+            # Перечитуємо ряд, щоб не затерти паралельні оновлення
+            series = await self._load(status_id)
+            series.last_checked = now
+            if not empty:
+                # Валідатори порожньої сторінки не зберігаємо, щоб наступний запит не отримав 304
+                series.etag = validators["etag"]
+                series.last_modified = validators["last_modified"]
+
+            changed = False
+            if stats is None:
+                if not empty:
+                    metrics.increment("engagement.not_modified")
+            else:
+                if len(series):
+                    # Невідомі лічильники беремо з останнього виміру
+                    last = series.sample(-1)
+                    stats = {
+                        field: last[field] if stats.get(field) is None else stats[field]
+                        for field in STAT_FIELDS
+                    }
+                changed = series.append(now, stats, self.max_samples)
+
+            await self.cache.set(self._series_key(status_id), series.to_cache(), self.history_ttl)
+
+        # Оновлюємо лічильники в закешованому пості замість повного перепарсингу
+        post = await self.cache.get(f"post:{status_id}", use_local=False)
+        if changed:
+            metrics.increment("engagement.changed")
+            updates = {
+                f"{field}_count": stats[field] for field in STAT_FIELDS if stats[field] is not None
+            }
+            if post and updates:
+                post.update(updates)
+                await self.cache.set(f"post:{status_id}", post)
+
+        return {
+            "post_id": status_id,
+            "post": post,
+            "engagement": series.sample(-1) if len(series) else None,
+            "delta": series.delta() if changed else {field: 0 for field in STAT_FIELDS},
+            "not_modified": stats is None and not empty,
+            "empty": empty,
+            "checked_at": now,
+        }
+
+    async def history(self, status_id: str) -> Dict[str, Any]:
+        """Часовий ряд лічильників посту"""
+        series = await self._load(status_id)
+        return {
+            "post_id": status_id,
+            "last_checked": series.last_checked,
+            "samples": [series.sample(i) for i in range(len(series))],
+        }
+
+    async def tracked(self) -> List[str]:
+        return await self.cache.get(self.TRACKED_KEY, use_local=False) or []
+
+    async def track(self, status_id: str):
+        """Додавання посту до регулярного оновлення"""
+        async with self.cache.locked(self.TRACKED_KEY):
+            tracked = await self.tracked()
+            if status_id not in tracked:
+                tracked.append(status_id)
+                await self.cache.set(self.TRACKED_KEY, tracked, self.history_ttl)
+
+    async def untrack(self, status_id: str):
+        """Припинення регулярного оновлення посту"""
+        async with self.cache.locked(self.TRACKED_KEY):
+            tracked = await self.tracked()
+            if status_id in tracked:
+                tracked.remove(status_id)
+                await self.cache.set(self.TRACKED_KEY, tracked, self.history_ttl)
+
+    async def refresh_all(self) -> int:
+        """Оновлення всіх відстежуваних постів (не більше concurrency одночасно)"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def refresh_one(status_id: str) -> bool:
+            async with semaphore:
+                try:
+                    await self.refresh(status_id)
+                    return True
+                except Exception as e:
+                    logger.error(f"Engagement refresh failed for {status_id}: {e}")
+                    metrics.increment("engagement.errors")
+                    return False
+
+        results = await asyncio.gather(*(refresh_one(status_id) for status_id in await self.tracked()))
+        return sum(results)
+
+    async def _scheduler_loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            # Один цикл оновлення на весь кластер
+            if not await self.cache.try_lock("engagement:scheduler", self.interval * 0.9):
+                continue
+
+            start_time = time.time()
+            refreshed = await self.refresh_all()
+            metrics.observe("engagement.refresh_all", time.time() - start_time)
+            logger.info(f"Refreshed engagement for {refreshed} tracked posts")
+
+    def start(self):
+        self._scheduler_task = asyncio.create_task(self._scheduler_loop())
+
+    async def stop(self):
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+            try:
+                await self._scheduler_task
+            except asyncio.CancelledError:
+                pass
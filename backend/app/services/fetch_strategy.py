@@ -0,0 +1,212 @@
+"""
+Fetch Strategy - Повтори з jitter, дедлайн запиту та хеджування між кількома endpoint-ами
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+from urllib.parse import urlparse
+
+from app.utils.deadline import shrink_timeout
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Статуси, після яких має сенс спробувати ще раз
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryableStatusError(Exception):
+    """Endpoint повернув тимчасову помилку"""
+
+    def __init__(self, response):
+        super().__init__(f"HTTP {response.status_code} from {response.request.url}")
+        self.response = response
+
+
+class EndpointStats:
+    """Ковзне вікно затримок одного endpoint-а"""
+
+    def __init__(self, window: int = 200):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+
+    def record(self, latency: float, ok: bool):
+        if ok:
+            self.successes += 1
+            self.latencies.append(latency)
+        else:
+            self.failures += 1
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        return {
+            "samples": len(self.latencies),
+            "successes": self.successes,
+            "failures": self.failures,
+            "p50": self.percentile(0.5),
+            "p90": self.percentile(0.9),
+            "p99": self.percentile(0.99),
+        }
+
+
+class FetchStrategy:
+    """GET з повторами, загальним дедлайном та хеджованими запитами"""
+
+    def __init__(
+        self,
+        session,
+        max_attempts: int = 3,
+        timeout: float = 30.0,
+        backoff_base: float = 0.2,
+        backoff_max: float = 2.0,
+        hedge_percentile: float = 0.9,
+        default_hedge_delay: float = 1.0,
+        min_hedge_delay: float = 0.05,
+        min_samples: int = 10,
+    ):
+        self.session = session
+        self.max_attempts = max_attempts
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.stats: Dict[str, EndpointStats] = {}
+
+    def _stats(self, url: str) -> EndpointStats:
+        host = urlparse(url).netloc
+        if host not in self.stats:
+            self.stats[host] = EndpointStats()
+        return self.stats[host]
+
+    def hedge_delay(self, url: str) -> float:
+        """Затримка перед хедж-запитом: заданий перцентиль затримок endpoint-а"""
+        stats = self._stats(url)
+        if len(stats.latencies) < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, stats.percentile(self.hedge_percentile))
+
+    def _order(self, urls: List[str]) -> List[str]:
+        """Найшвидший (за медіаною) endpoint іде першим"""
+        def median(url: str) -> float:
+            stats = self._stats(url)
+            if len(stats.latencies) < self.min_samples:
+                return float("inf")
+            return stats.percentile(0.5)
+
+        return sorted(urls, key=median)
+
+    async def _fetch_one(self, url: str, deadline: float, headers: Optional[Dict[str, str]]):
+        stats = self._stats(url)
+        start_time = time.monotonic()
+        try:
+            response = await self.session.get(
+                url, headers=headers, timeout=max(deadline - time.monotonic(), 0.1)
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.record(time.monotonic() - start_time, ok=False)
+            raise
+
+        latency = time.monotonic() - start_time
+        ok = response.status_code not in RETRYABLE_STATUSES
+        stats.record(latency, ok=ok)
+        metrics.observe(f"fetch.{urlparse(url).netloc}", latency)
+        return response
+
+    async def _race(self, urls: List[str], deadline: float, headers: Optional[Dict[str, str]]):
+        """Запуск запитів з хеджуванням; перемагає перша успішна відповідь"""
+        queue = list(urls)
+        pending = set()
+        last_error: Optional[Exception] = None
+
+        try:
+            while queue or pending:
+                wait_timeout = None
+                if queue:
+                    url = queue.pop(0)
+                    if pending:
+                        metrics.increment("fetch.hedged")
+                    pending.add(asyncio.create_task(self._fetch_one(url, deadline, headers)))
+                    if queue:
+                        wait_timeout = self.hedge_delay(url)
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                wait_timeout = remaining if wait_timeout is None else min(wait_timeout, remaining)
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    try:
+                        response = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+
+                    if response.status_code in RETRYABLE_STATUSES:
+                        last_error = RetryableStatusError(response)
+                        continue
+
+                    if len(urls) > 1:
+                        metrics.increment(f"fetch.wins.{urlparse(str(response.request.url)).netloc}")
+                    return response
+        finally:
+            # Скасовуємо запити, що програли
+            for task in pending:
+                task.cancel()
+
+        raise last_error or asyncio.TimeoutError("Request deadline exceeded")
+
+    async def fetch(
+        self,
+        urls: List[str],
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ):
+        """GET першої успішної відповіді серед еквівалентних URL"""
+        # Власний таймаут не виходить за межі дедлайну запиту
+        deadline = time.monotonic() + shrink_timeout(timeout or self.timeout, "fetch")
+        ordered = self._order(urls)
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.max_attempts):
+            try:
+                return await self._race(ordered, deadline, headers)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+                metrics.increment("fetch.failed_attempts")
+                logger.warning(f"Fetch attempt {attempt + 1}/{self.max_attempts} failed: {e}")
+
+            # Експоненційна затримка з повним jitter, в межах дедлайну
+            backoff = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            if attempt + 1 >= self.max_attempts or time.monotonic() + backoff >= deadline:
+                break
+            metrics.increment("fetch.retries")
+            await asyncio.sleep(backoff)
+
+        if isinstance(last_error, RetryableStatusError):
+            # Повертаємо відповідь, щоб викликач обробив статус через raise_for_status
+            return last_error.response
+        raise last_error or asyncio.TimeoutError("Request deadline exceeded")
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        return {host: stats.snapshot() for host, stats in self.stats.items()}
@@ -3,12 +3,15 @@ GPT Service - Інтеграція з OpenAI API для генерації ко
 """
 
 import logging
-import asyncio
+from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
 from pydantic import BaseModel
 import re
 import json
+import time
+
+from app.services.fetch_strategy import EndpointStats
+from app.utils.deadline import get_deadline
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,8 @@ class CommentRequest(BaseModel):
     images_description: Optional[str] = None
     video_description: Optional[str] = None
     engagement_stats: Optional[Dict[str, int]] = None
+    # Інші пости розмови (відповіді, цитати) для аналізу треду
+    thread_context: Optional[str] = None
     comment_count: int = 5
 
 class CommentResponse(BaseModel):
@@ -26,6 +31,7 @@ class CommentResponse(BaseModel):
     comments: List[str]
     analysis: Dict[str, Any]
     generated_at: str
+    usage: Optional[Dict[str, int]] = None
 
 class GPTService:
     """Сервіс для роботи з GPT API"""
@@ -35,12 +41,24 @@ class GPTService:
         api_key: str,
         model: str = "gpt-4o-mini",
         max_tokens: int = 500,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        timeout: float = 60.0,
+        min_generation_time: float = 2.0
     ):
+        # openai імпортується лише при створенні сервісу (швидший старт)
+        from openai import AsyncOpenAI
+        
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY is not configured")
+        
         self.client = AsyncOpenAI(api_key=api_key)
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.timeout = timeout
+        self.min_generation_time = min_generation_time
+        # Затримки генерації для оцінки, чи встигне виклик до дедлайну
+        self.latency = EndpointStats(window=100)
         
         # Системний промпт для генерації коментарів
         self.system_prompt = """Ти експерт з аналізу соціальних мереж та генерації релевантних коментарів. 
@@ -72,8 +90,21 @@ class GPTService:
     }
 }"""
     
+    def expected_generation_time(self) -> float:
+        """Очікувана тривалість генерації (медіана останніх викликів)"""
+        median = self.latency.percentile(0.5)
+        return max(self.min_generation_time, median or 0.0)
+    
     async def generate_comments(self, request: CommentRequest) -> CommentResponse:
         """Генерація коментарів до Twitter-посту"""
+        timeout = self.timeout
+        deadline = get_deadline()
+        if deadline is not None:
+            # Платний виклик не починається, якщо не встигне завершитися
+            deadline.ensure(self.expected_generation_time(), "generation")
+            timeout = deadline.shrink(timeout)
+        
+        start_time = time.monotonic()
         try:
             logger.info(f"Generating comments for post by {request.author}")
             
@@ -89,8 +120,10 @@ class GPTService:
                 ],
                 max_tokens=self.max_tokens,
                 temperature=self.temperature,
-                response_format={"type": "json_object"}
+                response_format={"type": "json_object"},
+                timeout=timeout
             )
+            self.latency.record(time.monotonic() - start_time, ok=True)
             
             # Парсинг відповіді
             content = response.choices[0].message.content
@@ -101,7 +134,12 @@ class GPTService:
             return CommentResponse(
                 comments=result['comments'],
                 analysis=result['analysis'],
-                generated_at=asyncio.get_event_loop().time()
+                generated_at=datetime.now(timezone.utc).isoformat(),
+                usage={
+                    "prompt_tokens": response.usage.prompt_tokens,
+                    "completion_tokens": response.usage.completion_tokens,
+                    "total_tokens": response.usage.total_tokens
+                } if response.usage else None
             )
             
         except Exception as e:
@@ -122,6 +160,9 @@ class GPTService:
         if request.video_description:
             prompt_parts.append(f"Відео: {request.video_description}")
         
+        if request.thread_context:
+            prompt_parts.append(f"Контекст розмови (відповіді та цитовані пости):\n{request.thread_context}")
+        
         # Додавання статистики
         if request.engagement_stats:
             stats = request.engagement_stats
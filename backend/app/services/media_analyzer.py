@@ -0,0 +1,225 @@
+"""
+Media Analyzer - Локальний аналіз зображень посту без виклику vision-моделі
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from app.services.cache import SharedCache
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+KIND_DESCRIPTIONS = {
+    "photo": "фото",
+    "text": "зображення з текстом (скріншот/інфографіка)",
+    "graphic": "графіка/ілюстрація",
+}
+
+
+def extract_image_features(
+    data: bytes,
+    draft_size: Tuple[int, int] = (256, 256),
+    max_pixels: int = 4096 * 4096,
+) -> Dict[str, Any]:
+    """Вилучення дешевих ознак зображення (виконується у пулі воркерів)"""
+    from PIL import Image, ImageFilter, ImageStat
+
+    with Image.open(io.BytesIO(data)) as source:
+        width, height = source.size
+        image_format = source.format
+
+        # Для JPEG декодування одразу у зменшеній роздільності (DCT scaling)
+        source.draft("RGB", draft_size)
+
+        # PNG/GIF/WebP декодуються повністю: пам'ять обмежуємо за кількістю пікселів
+        decoded_width, decoded_height = source.size
+        if decoded_width * decoded_height > max_pixels:
+            return {"skipped": True, "width": width, "height": height, "format": image_format}
+
+        image = source.convert("RGB")
+
+    image.thumbnail(draft_size)
+
+    # Домінантні кольори
+    small = image.resize((64, 64))
+    palette_image = small.quantize(colors=4, method=Image.Quantize.MEDIANCUT)
+    palette = palette_image.getpalette()
+    dominant_colors = [
+        "#%02x%02x%02x" % tuple(palette[index * 3:index * 3 + 3])
+        for _, index in sorted(palette_image.getcolors(), reverse=True)
+    ]
+
+    # Перцептивний хеш (dHash 8x8)
+    gray = image.convert("L")
+    pixels = list(gray.resize((9, 8), Image.Resampling.LANCZOS).getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+
+    # Текст: багато різких контурів при невеликій кількості кольорів
+    edges = gray.filter(ImageFilter.FIND_EDGES).point(lambda p: 255 if p > 64 else 0)
+    edge_density = ImageStat.Stat(edges).mean[0] / 255
+    unique_colors = len(small.getcolors(64 * 64) or [])
+
+    if edge_density > 0.12 and unique_colors < 600:
+        kind = "text"
+    elif unique_colors > 1500:
+        kind = "photo"
+    else:
+        kind = "graphic"
+
+    return {
+        "width": width,
+        "height": height,
+        "format": image_format,
+        "dominant_colors": dominant_colors,
+        "phash": f"{bits:016x}",
+        "edge_density": round(edge_density, 3),
+        "kind": kind,
+    }
+
+
+class MediaAnalyzer:
+    """Паралельне завантаження та аналіз зображень з обмеженням пам'яті"""
+
+    def __init__(
+        self,
+        cache: SharedCache,
+        max_bytes: int = 5 * 1024 * 1024,
+        per_host_limit: int = 4,
+        decode_workers: int = 2,
+        max_images: int = 4,
+        draft_size: Tuple[int, int] = (256, 256),
+        max_pixels: int = 4096 * 4096,
+        timeout: float = 10.0,
+    ):
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.per_host_limit = per_host_limit
+        self.max_images = max_images
+        self.draft_size = draft_size
+        self.max_pixels = max_pixels
+
+        import httpx
+
+        self.session = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+        self.executor = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="media-decode")
+        # Не більше decode_workers декодованих зображень у пам'яті одночасно
+        self._decode_semaphore = asyncio.Semaphore(decode_workers)
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_semaphores[host]
+
+    def _small_variant(self, url: str) -> Optional[str]:
+        """URL зменшеної версії зображення у pbs.twimg.com (None для інших хостів)"""
+        parsed = urlparse(url)
+        if parsed.netloc != "pbs.twimg.com":
+            return None
+
+        query = dict(parse_qsl(parsed.query))
+        query["name"] = "small"
+        return urlunparse(parsed._replace(query=urlencode(query)))
+
+    async def _fetch(self, url: str) -> Optional[bytes]:
+        """Завантаження зображення з обмеженням розміру"""
+        async with self._host_semaphore(url):
+            async with self.session.stream("GET", self._small_variant(url) or url) as response:
+                response.raise_for_status()
+
+                content_length = int(response.headers.get("Content-Length") or 0)
+                if content_length > self.max_bytes:
+                    metrics.increment("media.too_large")
+                    return None
+
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        metrics.increment("media.too_large")
+                        return None
+                    chunks.append(chunk)
+
+        metrics.increment("media.bytes_fetched", size)
+        return b"".join(chunks)
+
+    async def _analyze_bytes(self, data: bytes) -> Dict[str, Any]:
+        """Аналіз вмісту з кешуванням за хешем (однакові зображення з різних URL)"""
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        async def decode() -> Dict[str, Any]:
+            async with self._decode_semaphore:
+                loop = asyncio.get_running_loop()
+                features = await loop.run_in_executor(
+                    self.executor, extract_image_features, data, self.draft_size, self.max_pixels
+                )
+            if features.get("skipped"):
+                metrics.increment("media.too_many_pixels")
+            return features
+
+        return await self.cache.get_or_compute(f"media:sha:{content_hash}", decode)
+
+    async def analyze_image(self, url: str) -> Optional[Dict[str, Any]]:
+        """Ознаки одного зображення (кеш за URL)"""
+        async def compute() -> Dict[str, Any]:
+            data = await self._fetch(url)
+            if data is None:
+                return {"url": url, "skipped": True}
+            features = await self._analyze_bytes(data)
+            # Розміри зменшеної копії (name=small), а не оригіналу; орієнтація та сама
+            variant = "small" if self._small_variant(url) else "original"
+            return {"url": url, "variant": variant, **features}
+
+        url_key = hashlib.sha1(url.encode()).hexdigest()
+        try:
+            features = await self.cache.get_or_compute(f"media:url:{url_key}", compute)
+        except Exception as e:
+            logger.error(f"Error analyzing image {url}: {e}")
+            metrics.increment("media.errors")
+            return None
+
+        return None if features.get("skipped") else features
+
+    async def analyze_images(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Паралельний аналіз зображень посту"""
+        unique_urls = list(dict.fromkeys(urls))[: self.max_images]
+        results = await asyncio.gather(*(self.analyze_image(url) for url in unique_urls))
+        return [result for result in results if result]
+
+    def describe(self, total_images: int, features: List[Dict[str, Any]]) -> str:
+        """Текстовий опис зображень для промпту GPT"""
+        parts = [f"Пост містить {total_images} зображень"]
+
+        for index, item in enumerate(features, start=1):
+            orientation = "горизонтальне" if item["width"] > item["height"] else (
+                "вертикальне" if item["width"] < item["height"] else "квадратне"
+            )
+            size = f"{item['width']}x{item['height']}"
+            if item.get("variant") == "small":
+                size += " (зменшена копія)"
+            parts.append(
+                f"{index}) {KIND_DESCRIPTIONS[item['kind']]}, {orientation} "
+                f"{size}, домінантні кольори: {', '.join(item['dominant_colors'][:3])}"
+            )
+
+        return "; ".join(parts)
+
+    async def describe_images(self, urls: List[str]) -> str:
+        """Аналіз та опис зображень посту"""
+        features = await self.analyze_images(urls)
+        return self.describe(len(set(urls)), features)
+
+    async def close(self):
+        await self.session.aclose()
+        self.executor.shutdown(wait=False)
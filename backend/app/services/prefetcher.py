@@ -0,0 +1,204 @@
+"""
+Prefetcher - Спекулятивний прогрів кешу для /analyze після валідації URL
+"""
+
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.services.cache import SharedCache
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class Prefetcher:
+    """Фонове виконання прогріву з бюджетом, дедуплікацією та вимкненням під навантаженням"""
+
+    STATS_KEY = "prefetch:stats"
+    STATS_TTL = 30 * 24 * 3600
+
+    def __init__(
+        self,
+        cache: SharedCache,
+        concurrency: int = 2,
+        rate: float = 1.0,
+        max_load: int = 4,
+        ttl: int = 600,
+    ):
+        self.cache = cache
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_load = max_load
+        self.ttl = ttl
+
+        # Token bucket: rate прогрівів на секунду, запас - concurrency
+        self._tokens = float(concurrency)
+        self._refilled_at = time.monotonic()
+
+        # Активні /analyze цього воркера (сигнал навантаження)
+        self.active_requests = 0
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self.worker_id = os.getpid()
+
+    @contextmanager
+    def foreground(self):
+        """Облік запиту, що має пріоритет над прогрівом"""
+        self.active_requests += 1
+        try:
+            yield
+        finally:
+            self.active_requests -= 1
+
+    @property
+    def overloaded(self) -> bool:
+        return self.active_requests >= self.max_load
+
+    def _take_token(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(float(self.concurrency), self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _result_key(self, status_id: str) -> str:
+        return f"prefetch:result:{status_id}"
+
+    async def _record(self, **increments: float):
+        """Кластерні лічильники прогріву (атомарні, без блокування)"""
+        await self.cache.increment(self.STATS_KEY, increments, self.STATS_TTL)
+
+    def _spawn(self, coro: Awaitable[None]):
+        """Облік у спільному кеші - фоном, поза шляхом запиту"""
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def schedule(self, status_id: str, warm: Callable[[], Awaitable[None]]) -> bool:
+        """Запуск прогріву посту; повертає True, якщо прогрів прийнято
+
+        Рішення приймається за локальним станом воркера; перевірка кешу та
+        кластерна дедуплікація виконуються вже у фоновій задачі.
+        """
+        if status_id in self._tasks:
+            metrics.increment("prefetch.skipped.duplicate")
+            return False
+
+        if self.overloaded:
+            metrics.increment("prefetch.skipped.load")
+            return False
+
+        if len(self._tasks) >= self.concurrency or not self._take_token():
+            metrics.increment("prefetch.skipped.budget")
+            return False
+
+        self._tasks[status_id] = asyncio.create_task(self._run(status_id, warm))
+        return True
+
+    async def _run(self, status_id: str, warm: Callable[[], Awaitable[None]]):
+        result_key = self._result_key(status_id)
+        try:
+            if await self.cache.get(f"post:{status_id}") is not None:
+                metrics.increment("prefetch.skipped.cached")
+                return
+
+            # Один прогрів на весь кластер (ключ звільняється лише після ttl)
+            if not await self.cache.try_lock(f"prefetch:{status_id}", self.ttl):
+                metrics.increment("prefetch.skipped.duplicate")
+                return
+
+            # Лічильники прогріву у спільному кеші: влучання зараховується йому, хоч би який воркер його отримав
+            await self.cache.increment(result_key, {"scheduled": 1}, self.ttl)
+            await self._record(scheduled=1)
+            metrics.increment("prefetch.scheduled")
+
+            start_time = time.monotonic()
+            try:
+                await warm()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment("prefetch.failed")
+                logger.warning(f"Prefetch of {status_id} failed: {e}")
+                await self.cache.increment(result_key, {"failed": 1}, self.ttl)
+                await self._record(failed=1)
+                return
+
+            cost = time.monotonic() - start_time
+            counters = await self.cache.increment(result_key, {"done": 1, "cost": cost}, self.ttl)
+            metrics.increment("prefetch.completed")
+            await self._record(completed=1, cost_seconds=cost)
+            await self._credit(status_id, counters)
+        finally:
+            self._tasks.pop(status_id, None)
+
+    async def _credit(self, status_id: str, counters: Dict[str, float]):
+        """Зарахування зекономленого часу рівно один раз
+
+        Прогрів і перше влучання кожен спершу інкрементує свій лічильник, а потім
+        перевіряє чужий, тож завершення обох бачить принаймні один з них.
+        """
+        if counters.get("hits", 0) < 1 or counters.get("done", 0) < 1:
+            return
+
+        credited = await self.cache.increment(self._result_key(status_id), {"credited": 1}, self.ttl)
+        if credited.get("credited") == 1:
+            await self._record(saved_seconds=counters.get("cost", 0.0))
+
+    def consume(self, status_id: Optional[str]):
+        """Облік влучання: /analyze отримав прогрітий або ще прогрівуваний пост (фоном)"""
+        if status_id:
+            self._spawn(self._consume(status_id))
+
+    async def _consume(self, status_id: str):
+        result_key = self._result_key(status_id)
+        counters = await self.cache.counters(result_key)
+        if not counters.get("scheduled") or counters.get("failed"):
+            return
+
+        counters = await self.cache.increment(result_key, {"hits": 1}, self.ttl)
+        # Влучанням вважається лише перший /analyze після прогріву
+        if counters.get("hits") != 1:
+            return
+
+        metrics.increment("prefetch.hits")
+        if counters.get("done"):
+            await self._record(hits=1)
+        else:
+            # Прогрів ще триває (можливо, в іншому воркері)
+            await self._record(hits=1, hits_inflight=1)
+        await self._credit(status_id, counters)
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """Ефективність прогріву в межах кластера"""
+        stats = await self.cache.counters(self.STATS_KEY)
+        scheduled = stats.get("scheduled", 0)
+        completed = stats.get("completed", 0)
+        hits = stats.get("hits", 0)
+
+        return {
+            "worker_active": len(self._tasks),
+            "worker_overloaded": self.overloaded,
+            "scheduled": int(scheduled),
+            "completed": int(completed),
+            "failed": int(stats.get("failed", 0)),
+            "hits": int(hits),
+            "hits_inflight": int(stats.get("hits_inflight", 0)),
+            "hit_rate": round(hits / scheduled, 3) if scheduled else 0,
+            # Завершені, але ще не використані прогріви (включно з тими, що чекають на /analyze)
+            "wasted": int(max(0, completed - hits)),
+            "wasted_seconds": round(max(0.0, stats.get("cost_seconds", 0.0) - stats.get("saved_seconds", 0.0)), 3),
+        }
+
+    async def stop(self):
+        tasks = list(self._tasks.values()) + list(self._background)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
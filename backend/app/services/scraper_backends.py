@@ -0,0 +1,170 @@
+"""
+Scraper Backends - Взаємозамінні джерела даних посту для TwitterScraper
+"""
+
+import logging
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+BASE36_DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Назви бекендів для налаштування TWITTER_BACKENDS
+SCRAPER_BACKENDS = ("syndication", "html")
+
+
+def parse_backend_names(names: Union[str, Iterable[str]]) -> List[str]:
+    """Нормалізація та перевірка списку бекендів ("syndication, HTML" -> ["syndication", "html"])"""
+    if isinstance(names, str):
+        names = names.split(",")
+
+    normalized = [name.strip().lower() for name in names if name.strip()]
+    unknown = [name for name in normalized if name not in SCRAPER_BACKENDS]
+    if unknown:
+        raise ValueError(
+            f"unknown scraper backends: {', '.join(unknown)}; available: {', '.join(SCRAPER_BACKENDS)}"
+        )
+    if not normalized:
+        raise ValueError("at least one scraper backend is required")
+    return normalized
+
+
+class ScraperBackend(ABC):
+    """Джерело даних посту: повертає словник у форматі полів TwitterPost"""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def fetch_post(self, url: str, status_id: str) -> Optional[Dict[str, Any]]:
+        """Отримання даних посту або None, якщо бекенд не зміг їх отримати"""
+
+
+class HtmlBackend(ScraperBackend):
+    """Повна HTML-сторінка посту (найдорожчий, але універсальний шлях)"""
+
+    name = "html"
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+
+    async def fetch_post(self, url: str, status_id: str) -> Optional[Dict[str, Any]]:
+        return await self.scraper._scrape_html(url)
+
+
+def syndication_token(status_id: str) -> str:
+    """Токен syndication endpoint-а: (id / 1e15 * PI).toString(36) без нулів та крапки.
+
+    Дробова частина генерується як у JavaScript (найкоротше представлення double).
+    """
+    value = int(status_id) / 1e15 * math.pi
+    integer = int(value)
+    fraction = value - integer
+    delta = max(0.5 * (math.nextafter(value, math.inf) - value), math.nextafter(0.0, 1.0))
+
+    fraction_digits: List[int] = []
+    if fraction >= delta:
+        while True:
+            fraction *= 36
+            delta *= 36
+            digit = int(fraction)
+            fraction_digits.append(digit)
+            fraction -= digit
+
+            if (fraction > 0.5 or (fraction == 0.5 and digit & 1)) and fraction + delta > 1:
+                # Округлення вгору з переносом
+                while True:
+                    if not fraction_digits:
+                        integer += 1
+                        break
+                    last = fraction_digits.pop() + 1
+                    if last < 36:
+                        fraction_digits.append(last)
+                        break
+                break
+
+            if fraction < delta:
+                break
+
+    integer_digits = ""
+    while integer:
+        integer, remainder = divmod(integer, 36)
+        integer_digits = BASE36_DIGITS[remainder] + integer_digits
+
+    token = integer_digits + "".join(BASE36_DIGITS[digit] for digit in fraction_digits)
+    return token.replace("0", "")
+
+
+class SyndicationBackend(ScraperBackend):
+    """Компактний JSON syndication/embed endpoint (без HTML та селекторів)"""
+
+    name = "syndication"
+
+    def __init__(self, fetcher, base_url: str = "https://cdn.syndication.twimg.com", timeout: float = 5.0):
+        self.fetcher = fetcher
+        self.base_url = base_url.rstrip("/")
+        # Власний короткий таймаут: завислий endpoint не забирає бюджет HTML fallback-у
+        self.timeout = timeout
+
+    async def fetch_post(self, url: str, status_id: str) -> Optional[Dict[str, Any]]:
+        response = await self.fetcher.fetch(
+            [f"{self.base_url}/tweet-result?id={status_id}&token={syndication_token(status_id)}&lang=en"],
+            headers={"Accept": "application/json"},
+            timeout=self.timeout,
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+
+        metrics.increment(f"scraper.{self.name}.bytes", len(response.content))
+        data = response.json()
+        if not data or data.get("__typename") == "TweetTombstone":
+            return None
+
+        return self._map_post(data, url)
+
+    def _map_post(self, data: Dict[str, Any], url: str) -> Dict[str, Any]:
+        """Перетворення JSON відповіді у поля TwitterPost"""
+        user = data.get("user") or {}
+        media = data.get("mediaDetails") or []
+
+        images: List[str] = [
+            item["media_url_https"] for item in media
+            if item.get("type") == "photo" and item.get("media_url_https")
+        ]
+        if not images:
+            images = [photo["url"] for photo in data.get("photos") or [] if photo.get("url")]
+
+        video_url = None
+        for item in media:
+            variants = (item.get("video_info") or {}).get("variants") or []
+            mp4 = [v for v in variants if v.get("content_type") == "video/mp4"]
+            if mp4:
+                video_url = max(mp4, key=lambda v: v.get("bitrate") or 0)["url"]
+                break
+
+        # Батьківський пост, цитата та відповідь - для обходу розмови
+        related_ids: List[str] = []
+        for related_id in (
+            (data.get("parent") or {}).get("id_str"),
+            data.get("in_reply_to_status_id_str"),
+            (data.get("quoted_tweet") or {}).get("id_str"),
+        ):
+            if related_id and related_id != data.get("id_str") and related_id not in related_ids:
+                related_ids.append(related_id)
+
+        return {
+            "url": url,
+            "text": data.get("text", ""),
+            "author": f"@{user['screen_name']}" if user.get("screen_name") else "",
+            "timestamp": data.get("created_at"),
+            "images": images,
+            "video_url": video_url,
+            "likes_count": data.get("favorite_count"),
+            "retweets_count": data.get("retweet_count"),
+            "replies_count": data.get("conversation_count"),
+            "related_status_ids": related_ids,
+        }
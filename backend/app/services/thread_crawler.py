@@ -0,0 +1,169 @@
+"""
+Thread Crawler - Обхід розмови (пост, відповіді, цитати) з обмеженою конкурентністю
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.services.twitter_scraper import PostRecord
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Обмеження довжини одного посту в контексті для GPT
+CONTEXT_POST_CHARS = 280
+
+
+class ThreadNode:
+    """Вузол розмови: пост або помилка його отримання"""
+
+    __slots__ = ("status_id", "depth", "parent_id", "post", "error")
+
+    def __init__(
+        self,
+        status_id: str,
+        depth: int,
+        parent_id: Optional[str],
+        post: Optional[PostRecord] = None,
+        error: Optional[str] = None,
+    ):
+        self.status_id = status_id
+        self.depth = depth
+        self.parent_id = parent_id
+        self.post = post
+        self.error = error
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "status_id": self.status_id,
+            "depth": self.depth,
+            "parent_id": self.parent_id,
+        }
+        if self.post is None:
+            data["error"] = self.error
+            return data
+
+        data.update(self.post.public_dict())
+        return data
+
+
+class ConversationGraph:
+    """Компактний граф розмови: вузли за ID та ребра (звідки знайдено -> що знайдено)"""
+
+    __slots__ = ("root_id", "nodes", "edges")
+
+    def __init__(self, root_id: str):
+        self.root_id = root_id
+        self.nodes: Dict[str, ThreadNode] = {}
+        self.edges: List[Tuple[str, str]] = []
+
+    def add(self, node: ThreadNode):
+        self.nodes[node.status_id] = node
+        if node.parent_id is not None:
+            self.edges.append((node.parent_id, node.status_id))
+
+    @property
+    def posts(self) -> List[ThreadNode]:
+        """Успішно отримані вузли в порядку обходу (корінь - першим)"""
+        return sorted(
+            (node for node in self.nodes.values() if node.post is not None),
+            key=lambda node: node.depth,
+        )
+
+    def context(self, max_chars: int = 4000) -> str:
+        """Текст розмови для GPT (без кореневого посту)"""
+        lines: List[str] = []
+        total = 0
+        for node in self.posts:
+            if node.status_id == self.root_id:
+                continue
+            text = node.post.text[:CONTEXT_POST_CHARS]
+            line = f"- {node.post.author or 'невідомий автор'}: {text}"
+            if total + len(line) > max_chars:
+                break
+            lines.append(line)
+            total += len(line) + 1
+        return "\n".join(lines)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "root_id": self.root_id,
+            "nodes": len(self.nodes),
+            "fetched": sum(1 for node in self.nodes.values() if node.post is not None),
+            "edges": [list(edge) for edge in self.edges],
+        }
+
+
+class ThreadCrawler:
+    """BFS-обхід пов'язаних постів з дедуплікацією та лімітами глибини і розміру
+
+    Ребра беруться з PostRecord.related_status_ids, тобто покриття розмови
+    обмежене тим, що повідомляє бекенд (syndication: батьківський і цитований пост).
+    """
+
+    def __init__(
+        self,
+        fetch_post: Callable[[str], Awaitable[PostRecord]],
+        concurrency: int = 4,
+        max_depth: int = 2,
+        max_posts: int = 20,
+    ):
+        self.fetch_post = fetch_post
+        self.concurrency = concurrency
+        self.max_depth = max_depth
+        self.max_posts = max_posts
+
+    @staticmethod
+    def status_url(status_id: str) -> str:
+        return f"https://x.com/i/status/{status_id}"
+
+    async def _fetch_node(
+        self, semaphore: asyncio.Semaphore, url: str, status_id: str, depth: int, parent_id: Optional[str]
+    ) -> ThreadNode:
+        async with semaphore:
+            try:
+                post = await self.fetch_post(url)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.increment("thread.failed")
+                logger.warning(f"Thread crawl failed for {status_id}: {e}")
+                return ThreadNode(status_id, depth, parent_id, error=str(e))
+
+        metrics.increment("thread.fetched")
+        return ThreadNode(status_id, depth, parent_id, post=post)
+
+    async def crawl(self, root_url: str, graph: ConversationGraph) -> AsyncIterator[ThreadNode]:
+        """Обхід розмови; вузли повертаються в міру отримання"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        seen: Set[str] = set()
+        pending: Set[asyncio.Task] = set()
+
+        def enqueue(url: str, status_id: str, depth: int, parent_id: Optional[str]):
+            if status_id in seen or len(seen) >= self.max_posts:
+                return
+            seen.add(status_id)
+            pending.add(asyncio.create_task(self._fetch_node(semaphore, url, status_id, depth, parent_id)))
+
+        enqueue(root_url, graph.root_id, 0, None)
+
+        try:
+            while pending:
+                done, pending_left = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                pending.clear()
+                pending.update(pending_left)
+
+                for task in done:
+                    node = task.result()
+                    graph.add(node)
+                    yield node
+
+                    if node.post is None or node.depth >= self.max_depth:
+                        continue
+                    for related_id in node.post.related_status_ids:
+                        enqueue(self.status_url(related_id), related_id, node.depth + 1, node.status_id)
+        finally:
+            # Клієнт від'єднався або обхід перервано - решта запитів не потрібна
+            for task in pending:
+                task.cancel()
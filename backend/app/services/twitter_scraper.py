@@ -6,12 +6,20 @@ Twitter Scraper Service
 import re
 import logging
 import asyncio
-from typing import Optional, Dict, List, Any
+import time
+from typing import TYPE_CHECKING, Optional, Dict, List, Any, Sequence, Tuple
 from urllib.parse import urlparse
-import httpx
-from bs4 import BeautifulSoup
 from pydantic import BaseModel, HttpUrl
 
+from app.services.fetch_strategy import EndpointStats, FetchStrategy
+from app.services.scraper_backends import HtmlBackend, ScraperBackend, SyndicationBackend, parse_backend_names
+from app.utils.deadline import DeadlineExceeded
+from app.utils.metrics import metrics
+
+# bs4 та httpx імпортуються при першому використанні (швидший старт)
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
 logger = logging.getLogger(__name__)
 
 class TwitterPost(BaseModel):
@@ -25,13 +33,138 @@ class TwitterPost(BaseModel):
     likes_count: Optional[int] = None
     retweets_count: Optional[int] = None
     replies_count: Optional[int] = None
+    # ID постів, на які посилається сторінка (відповіді, цитати, батьківський пост)
+    related_status_ids: List[str] = []
+
+class PostRecord:
+    """Компактний внутрішній запис посту
+    
+    Дані валідуються один раз (TwitterPost при скрейпінгу), а з кешу
+    відновлюються без повторної валідації.
+    """
+    
+    __slots__ = (
+        "url", "text", "author", "timestamp", "images", "video_url",
+        "likes_count", "retweets_count", "replies_count", "related_status_ids"
+    )
+    
+    def __init__(
+        self,
+        url: str,
+        text: str,
+        author: str,
+        timestamp: Optional[str] = None,
+        images: Optional[List[str]] = None,
+        video_url: Optional[str] = None,
+        likes_count: Optional[int] = None,
+        retweets_count: Optional[int] = None,
+        replies_count: Optional[int] = None,
+        related_status_ids: Optional[List[str]] = None
+    ):
+        self.url = url
+        self.text = text
+        self.author = author
+        self.timestamp = timestamp
+        self.images = images or []
+        self.video_url = video_url
+        self.likes_count = likes_count
+        self.retweets_count = retweets_count
+        self.replies_count = replies_count
+        self.related_status_ids = related_status_ids or []
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PostRecord":
+        """Відновлення з кешованого словника (вже валідованого)
+        
+        Невідомі ключі ігноруються: у спільному кеші можуть бути записи іншої версії.
+        """
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+    
+    @classmethod
+    def from_model(cls, post: TwitterPost) -> "PostRecord":
+        return cls(**post.model_dump(mode="json"))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Формат кешу (поля TwitterPost)"""
+        return {field: getattr(self, field) for field in self.__slots__}
+    
+    def engagement(self) -> Dict[str, Optional[int]]:
+        return {
+            "likes": self.likes_count,
+            "retweets": self.retweets_count,
+            "replies": self.replies_count
+        }
+    
+    def public_dict(self) -> Dict[str, Any]:
+        """Пост у форматі відповіді API"""
+        return {
+            "url": self.url,
+            "text": self.text,
+            "author": self.author,
+            "images": self.images,
+            "video_url": self.video_url,
+            "engagement": self.engagement()
+        }
+    
+    def summary_dict(self) -> Dict[str, Any]:
+        """Короткий опис посту"""
+        return {
+            "url": self.url,
+            "text": self.text,
+            "author": self.author,
+            "has_images": len(self.images) > 0,
+            "has_video": self.video_url is not None,
+            "image_count": len(self.images),
+            "engagement": self.engagement()
+        }
+
+# Селектори блоку статистики посту
+STATS_SELECTORS = {
+    'likes': '[data-testid="like"]',
+    'retweets': '[data-testid="retweet"]',
+    'replies': '[data-testid="reply"]'
+}
+
+# Посилання на інші пости (ID беремо з /status/<id>)
+STATUS_LINK_PATTERN = re.compile(r"/status/(\d+)")
+MAX_RELATED_STATUS_IDS = 50
+
+# Парсимо лише елементи статистики, решту сторінки пропускаємо
+STATS_ATTRS = {"data-testid": ["like", "retweet", "reply"]}
+
+COUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+def parse_count(text: str) -> Optional[int]:
+    """Перетворення лічильника Twitter у число ("1.2K" -> 1200, "3,456" -> 3456)"""
+    match = re.search(r"(\d[\d,]*(?:\.\d+)?)(?:\s?([KkMmBb])(?![A-Za-z]))?", text or "")
+    if not match:
+        return None
+    
+    number, suffix = match.groups()
+    value = float(number.replace(",", ""))
+    if suffix:
+        value *= COUNT_SUFFIXES[suffix.lower()]
+    return int(round(value))
 
 class TwitterScraper:
     """Сервіс для парсингу Twitter-постів"""
     
-    def __init__(self):
+    # Еквівалентні хости, між якими хеджуються запити
+    MIRROR_HOSTS = ["x.com", "twitter.com"]
+    
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        retry_attempts: int = 3,
+        hedge_percentile: float = 0.9,
+        backends: Sequence[str] = ("syndication", "html"),
+        syndication_base_url: str = "https://cdn.syndication.twimg.com",
+        syndication_timeout: float = 5.0
+    ):
+        import httpx
+        
         self.session = httpx.AsyncClient(
-            timeout=30.0,
+            timeout=timeout,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -42,6 +175,23 @@ class TwitterScraper:
             },
             follow_redirects=True
         )
+        self.fetcher = FetchStrategy(
+            self.session,
+            max_attempts=retry_attempts,
+            timeout=timeout,
+            hedge_percentile=hedge_percentile
+        )
+        
+        available_backends = {
+            "syndication": lambda: SyndicationBackend(
+                self.fetcher, base_url=syndication_base_url, timeout=syndication_timeout
+            ),
+            "html": lambda: HtmlBackend(self),
+        }
+        self.backends: List[ScraperBackend] = [
+            available_backends[name]() for name in parse_backend_names(backends)
+        ]
+        self.backend_stats: Dict[str, EndpointStats] = {}
     
     async def __aenter__(self):
         return self
@@ -61,18 +211,66 @@ class TwitterScraper:
             return bool(re.search(pattern, parsed.path))
         except Exception:
             return False
+
+    def extract_status_id(self, url: str) -> Optional[str]:
+        """Вилучення ID посту з Twitter URL"""
+        match = re.search(r"/status/(\d+)", urlparse(url).path)
+        return match.group(1) if match else None
+
+    def _mirror_urls(self, url: str) -> List[str]:
+        """Той самий пост на всіх дзеркальних хостах (оригінальний URL - першим)"""
+        parsed = urlparse(url)
+        urls = [url]
+        for host in self.MIRROR_HOSTS:
+            if parsed.netloc.removeprefix("www.") != host:
+                urls.append(parsed._replace(netloc=host).geturl())
+        return urls
     
     async def scrape_post(self, url: str) -> Optional[TwitterPost]:
-        """Парсинг Twitter-посту"""
-        try:
-            if not self.validate_twitter_url(url):
-                raise ValueError("Invalid Twitter URL format")
+        """Парсинг Twitter-посту: бекенди по черзі, HTML - останній fallback"""
+        if not self.validate_twitter_url(url):
+            raise ValueError("Failed to scrape Twitter post: Invalid Twitter URL format")
+        
+        status_id = self.extract_status_id(url)
+        last_error: Optional[Exception] = None
+        
+        for backend in self.backends:
+            stats = self.backend_stats.setdefault(backend.name, EndpointStats())
+            start_time = time.perf_counter()
+            
+            try:
+                post_data = await backend.fetch_post(url, status_id)
+            except (asyncio.CancelledError, DeadlineExceeded):
+                # Наступні бекенди вже не встигнуть до дедлайну запиту
+                raise
+            except Exception as e:
+                post_data = None
+                last_error = e
+                logger.warning(f"Scraper backend {backend.name} failed for {url}: {e}")
+            
+            elapsed = time.perf_counter() - start_time
+            ok = bool(post_data and post_data.get("text"))
+            stats.record(elapsed, ok=ok)
+            metrics.observe(f"scraper.{backend.name}", elapsed)
+            metrics.increment(f"scraper.{backend.name}.{'success' if ok else 'failure'}")
             
+            if ok:
+                return TwitterPost(**post_data)
+        
+        raise ValueError(f"Failed to scrape Twitter post: {last_error or 'Could not extract post data'}")
+    
+    async def _scrape_html(self, url: str) -> Optional[Dict[str, Any]]:
+        """Отримання даних посту з повної HTML-сторінки"""
+        import httpx
+        from bs4 import BeautifulSoup
+        
+        try:
             logger.info(f"Scraping Twitter post: {url}")
             
             # Отримання HTML сторінки
-            response = await self.session.get(url)
+            response = await self.fetcher.fetch(self._mirror_urls(url))
             response.raise_for_status()
+            metrics.increment("scraper.html.bytes", len(response.content))
             
             soup = BeautifulSoup(response.text, 'html.parser')
             
@@ -82,8 +280,10 @@ class TwitterScraper:
             if not post_data:
                 raise ValueError("Could not extract post data")
             
-            return TwitterPost(**post_data)
+            return post_data
             
+        except DeadlineExceeded:
+            raise
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error while scraping {url}: {e}")
             raise ValueError(f"Failed to access Twitter post: {e}")
@@ -91,7 +291,7 @@ class TwitterScraper:
             logger.error(f"Error scraping {url}: {e}")
             raise ValueError(f"Failed to scrape Twitter post: {e}")
     
-    async def _extract_post_data(self, soup: BeautifulSoup, url: str) -> Optional[Dict[str, Any]]:
+    async def _extract_post_data(self, soup: "BeautifulSoup", url: str) -> Optional[Dict[str, Any]]:
         """Вилучення даних з HTML"""
         try:
             # Базові дані
@@ -103,7 +303,8 @@ class TwitterScraper:
                 "video_url": None,
                 "likes_count": None,
                 "retweets_count": None,
-                "replies_count": None
+                "replies_count": None,
+                "related_status_ids": []
             }
             
             # Вилучення тексту посту
@@ -177,31 +378,13 @@ class TwitterScraper:
             
             # Вилучення статистики (лайки, ретвіти, коментарі)
             # Це може бути складніше через динамічний контент
-            stats_selectors = {
-                'likes': '[data-testid="like"]',
-                'retweets': '[data-testid="retweet"]',
-                'replies': '[data-testid="reply"]'
-            }
+            stats = self._extract_stats(soup)
+            post_data["likes_count"] = stats["likes"]
+            post_data["retweets_count"] = stats["retweets"]
+            post_data["replies_count"] = stats["replies"]
             
-            for stat_type, selector in stats_selectors.items():
-                elements = soup.select(selector)
-                if elements:
-                    # Спробуємо знайти число поруч з іконкою
-                    for element in elements:
-                        parent = element.parent
-                        if parent:
-                            text = parent.get_text(strip=True)
-                            # Шукаємо число в тексті
-                            numbers = re.findall(r'\d+', text)
-                            if numbers:
-                                count = int(numbers[0])
-                                if stat_type == 'likes':
-                                    post_data["likes_count"] = count
-                                elif stat_type == 'retweets':
-                                    post_data["retweets_count"] = count
-                                elif stat_type == 'replies':
-                                    post_data["replies_count"] = count
-                                break
+            # Пов'язані пости для обходу розмови
+            post_data["related_status_ids"] = self._extract_related_ids(soup, url)
             
             # Якщо не знайшли текст, спробуємо альтернативні методи
             if not post_data["text"]:
@@ -235,22 +418,99 @@ class TwitterScraper:
             logger.error(f"Error extracting post data: {e}")
             return None
     
+    def _extract_related_ids(self, soup: "BeautifulSoup", url: str) -> List[str]:
+        """ID інших постів, на які посилається сторінка (у порядку появи)"""
+        own_id = self.extract_status_id(url)
+        related: List[str] = []
+        
+        for link in soup.select('a[href*="/status/"]'):
+            match = STATUS_LINK_PATTERN.search(link.get('href', ''))
+            if not match:
+                continue
+            status_id = match.group(1)
+            if status_id != own_id and status_id not in related:
+                related.append(status_id)
+                if len(related) >= MAX_RELATED_STATUS_IDS:
+                    break
+        
+        return related
+    
+    def _extract_stats(self, soup: "BeautifulSoup") -> Dict[str, Optional[int]]:
+        """Вилучення лічильників лайків, ретвітів та коментарів"""
+        stats = {stat_type: None for stat_type in STATS_SELECTORS}
+        
+        for stat_type, selector in STATS_SELECTORS.items():
+            for element in soup.select(selector):
+                # aria-label містить точне число ("1234 Likes"), текст - скорочене ("1.2K")
+                candidates = [element.get('aria-label', ''), element.get_text(strip=True)]
+                
+                # Текст батька - лише якщо в ньому немає інших лічильників (при SoupStrainer
+                # батьком є корінь документа з текстом усіх кнопок разом)
+                parent = element.parent
+                if parent is not None and parent.name != '[document]' and len(parent.find_all(attrs=STATS_ATTRS)) == 1:
+                    candidates.append(parent.get_text(strip=True))
+                
+                for candidate in candidates:
+                    count = parse_count(candidate)
+                    if count is not None:
+                        stats[stat_type] = count
+                        break
+                
+                # Кнопка без числа ("Like") - нуль взаємодій
+                if stats[stat_type] is None and element.get('aria-label'):
+                    stats[stat_type] = 0
+                
+                if stats[stat_type] is not None:
+                    break
+        
+        return stats
+    
+    async def fetch_engagement(
+        self,
+        url: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Tuple[Optional[Dict[str, Optional[int]]], Dict[str, Optional[str]]]:
+        """Легке оновлення статистики посту з умовним запитом.
+        
+        Повертає (статистика або None, якщо сторінка не змінилась; нові валідатори).
+        """
+        import httpx
+        from bs4 import BeautifulSoup, SoupStrainer
+        
+        if not self.validate_twitter_url(url):
+            raise ValueError("Invalid Twitter URL format")
+        
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        try:
+            response = await self.fetcher.fetch(self._mirror_urls(url), headers=headers)
+            
+            validators = {
+                "etag": response.headers.get("ETag", etag),
+                "last_modified": response.headers.get("Last-Modified", last_modified)
+            }
+            
+            if response.status_code == 304:
+                return None, validators
+            
+            response.raise_for_status()
+            
+            soup = BeautifulSoup(response.text, 'html.parser', parse_only=SoupStrainer(attrs=STATS_ATTRS))
+            return self._extract_stats(soup), validators
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"HTTP error while refreshing engagement for {url}: {e}")
+            raise ValueError(f"Failed to access Twitter post: {e}")
+    
     async def get_post_summary(self, url: str) -> Dict[str, Any]:
         """Отримання короткого опису посту"""
         post = await self.scrape_post(url)
         if not post:
             raise ValueError("Failed to scrape post")
         
-        return {
-            "url": str(post.url),
-            "text": post.text,
-            "author": post.author,
-            "has_images": len(post.images) > 0,
-            "has_video": post.video_url is not None,
-            "image_count": len(post.images),
-            "engagement": {
-                "likes": post.likes_count,
-                "retweets": post.retweets_count,
-                "replies": post.replies_count
-            }
-        }
+        return PostRecord.from_model(post).summary_dict()
@@ -0,0 +1,88 @@
+"""
+Request Deadlines and Client Disconnect Handling
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Optional
+
+from app.utils.metrics import metrics
+
+
+class DeadlineExceeded(Exception):
+    """Залишку часу запиту не вистачає для наступного етапу"""
+
+
+class ClientDisconnected(Exception):
+    """Клієнт закрив з'єднання до завершення обробки"""
+
+
+class Deadline:
+    """Наскрізний дедлайн запиту"""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def shrink(self, timeout: float) -> float:
+        """Власний таймаут етапу, обмежений залишком дедлайну"""
+        return min(timeout, self.remaining())
+
+    def ensure(self, needed: float, stage: str):
+        """Не починати етап, якщо він не встигне завершитися"""
+        if self.remaining() < needed:
+            metrics.increment(f"deadline.skipped.{stage}")
+            raise DeadlineExceeded(
+                f"Not enough time left for {stage}: {self.remaining():.2f}s < {needed:.2f}s"
+            )
+
+
+current_deadline: ContextVar[Optional[Deadline]] = ContextVar("current_deadline", default=None)
+
+
+def get_deadline() -> Optional[Deadline]:
+    """Дедлайн поточного запиту (якщо встановлений)"""
+    return current_deadline.get()
+
+
+def shrink_timeout(timeout: float, stage: str) -> float:
+    """Таймаут з урахуванням дедлайну поточного запиту"""
+    deadline = get_deadline()
+    if deadline is None:
+        return timeout
+
+    timeout = deadline.shrink(timeout)
+    if timeout <= 0:
+        metrics.increment(f"deadline.skipped.{stage}")
+        raise DeadlineExceeded(f"Request deadline exceeded before {stage}")
+    return timeout
+
+
+async def run_until_disconnected(request, awaitable: Awaitable[Any], poll_interval: float = 0.25) -> Any:
+    """Виконання обробки зі скасуванням, щойно клієнт від'єднався"""
+    task = asyncio.ensure_future(awaitable)
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+
+            if await request.is_disconnected():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
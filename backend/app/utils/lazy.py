@@ -0,0 +1,70 @@
+"""
+Lazy Service Initialization
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LazyService:
+    """Проксі, що створює сервіс при першому зверненні до нього"""
+
+    def __init__(
+        self,
+        name: str,
+        factory: Callable[[], Any],
+        closer: Optional[Callable[[Any], Awaitable[None]]] = None,
+    ):
+        self._name = name
+        self._factory = factory
+        self._closer = closer
+        self._instance = None
+        self._lock = threading.Lock()
+
+    @property
+    def service_name(self) -> str:
+        return self._name
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def instance(self) -> Any:
+        """Отримання (і за потреби створення) сервісу
+
+        Назва не збігається з методами сервісів (напр. AnalysisStore.get),
+        тож усі інші атрибути прозоро проксуються до сервісу.
+        """
+        if self._instance is None:
+            # Сервіс може створюватися одночасно фоновим прогрівом і запитом
+            with self._lock:
+                if self._instance is None:
+                    start_time = time.perf_counter()
+                    self._instance = self._factory()
+                    elapsed = time.perf_counter() - start_time
+
+                    metrics.observe(f"startup.init.{self._name}", elapsed)
+                    logger.info(f"Initialized {self._name} in {elapsed * 1000:.1f}ms")
+
+        return self._instance
+
+    async def ainstance(self) -> Any:
+        """Отримання сервісу без блокування event loop (створення - у потоці)"""
+        if self._instance is not None:
+            return self._instance
+        return await asyncio.to_thread(self.instance)
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.instance(), attr)
+
+    async def aclose(self):
+        """Закриття сервісу, якщо він був створений"""
+        if self._instance is not None and self._closer is not None:
+            await self._closer(self._instance)
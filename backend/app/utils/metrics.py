@@ -0,0 +1,45 @@
+"""
+Metrics Collection
+"""
+
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+
+class Metrics:
+    """Прості лічильники та таймінги в межах процесу"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1):
+        """Збільшення лічильника"""
+        self.counters[name] += value
+
+    def observe(self, name: str, seconds: float):
+        """Запис тривалості операції"""
+        timing = self.timings.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+        timing["count"] += 1
+        timing["total"] += seconds
+        timing["max"] = max(timing["max"], seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Поточний стан метрик"""
+        return {
+            "uptime": time.time() - self.started_at,
+            "counters": dict(self.counters),
+            "timings": {
+                name: {
+                    "count": timing["count"],
+                    "average": timing["total"] / timing["count"] if timing["count"] else 0.0,
+                    "max": timing["max"],
+                }
+                for name, timing in self.timings.items()
+            },
+        }
+
+
+metrics = Metrics()
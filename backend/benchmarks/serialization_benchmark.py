@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Serialization benchmark: вартість побудови та серіалізації відповіді /analyze на кеш-хіті
+
+Приклад:
+    python benchmarks/serialization_benchmark.py --iterations 20000 --budget-us 50
+
+Порівнює попередній шлях (TwitterPost -> словник -> AnalyzeResponse -> jsonable_encoder
+-> json) з поточним (PostRecord -> словник -> orjson). Повертає ненульовий код виходу,
+якщо поточний шлях перевищує бюджет.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+import orjson  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.api.routes.twitter import AnalyzeResponse  # noqa: E402
+from app.services.gpt_service import CommentResponse  # noqa: E402
+from app.services.twitter_scraper import PostRecord, TwitterPost  # noqa: E402
+
+# Типові дані з кешу: post:{id} та gen:{hash}
+CACHED_POST = {
+    "url": "https://x.com/example/status/1790000000000000000",
+    "text": "Benchmark post text " * 10,
+    "author": "@example",
+    "timestamp": "2026-01-01T12:00:00.000Z",
+    "images": [f"https://pbs.twimg.com/media/example{i}.jpg" for i in range(4)],
+    "video_url": None,
+    "likes_count": 12345,
+    "retweets_count": 678,
+    "replies_count": 90,
+    "related_status_ids": ["1790000000000000001", "1790000000000000002"],
+}
+CACHED_COMMENTS = {
+    "comments": [f"Коментар номер {i} до посту" for i in range(5)],
+    "analysis": {
+        "tone": "нейтральний",
+        "topics": ["технології", "новини"],
+        "sentiment": "позитивний",
+        "engagement_potential": "високий",
+    },
+    "generated_at": "2026-01-01T12:00:01+00:00",
+    "usage": {"prompt_tokens": 250, "completion_tokens": 180, "total_tokens": 430},
+}
+
+
+def legacy_response() -> bytes:
+    """Попередній шлях: валідація на кожному кроці та стандартний json"""
+    post = TwitterPost(**CACHED_POST)
+    comments = CommentResponse(**CACHED_COMMENTS)
+    response_data = {
+        "post": {
+            "url": str(post.url),
+            "text": post.text,
+            "author": post.author,
+            "images": post.images,
+            "video_url": post.video_url,
+            "engagement": {
+                "likes": post.likes_count,
+                "retweets": post.retweets_count,
+                "replies": post.replies_count,
+            },
+        },
+        "comments": comments.comments,
+        "analysis": comments.analysis,
+        "processing_time": 0.01,
+        "status": "success",
+    }
+    response = AnalyzeResponse(**response_data)
+    return json.dumps(jsonable_encoder(response), ensure_ascii=False).encode("utf-8")
+
+
+def current_response() -> bytes:
+    """Поточний шлях: компактний запис без повторної валідації та orjson"""
+    post = PostRecord.from_dict(CACHED_POST)
+    comments = CommentResponse.model_construct(**CACHED_COMMENTS)
+    response_data = {
+        "post": post.public_dict(),
+        "comments": comments.comments,
+        "analysis": comments.analysis,
+        "processing_time": 0.01,
+        "status": "success",
+    }
+    return orjson.dumps(response_data)
+
+
+def measure(func, iterations: int) -> float:
+    """Середній час одного виклику, мкс"""
+    for _ in range(min(iterations, 1000)):
+        func()
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start_time) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serialization benchmark for /analyze responses")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--budget-us", type=float, default=None, help="Бюджет поточного шляху, мкс на запит")
+    args = parser.parse_args()
+
+    # Обидва шляхи мають давати однаковий JSON
+    if json.loads(legacy_response()) != orjson.loads(current_response()):
+        raise SystemExit("Legacy and current responses differ")
+
+    legacy = measure(legacy_response, args.iterations)
+    current = measure(current_response, args.iterations)
+
+    print(f"Response size: {len(current_response())} bytes")
+    print(f"Legacy path:   {legacy:8.1f} us/request")
+    print(f"Current path:  {current:8.1f} us/request ({legacy / current:.1f}x faster)")
+
+    if args.budget_us is not None and current > args.budget_us:
+        print(f"FAIL: current path exceeds budget of {args.budget_us:.1f} us")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
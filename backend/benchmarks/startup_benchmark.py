@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: час імпорту модулів та час до першого запиту
+
+Приклад:
+    python benchmarks/startup_benchmark.py --import-budget 1.0 --first-request-budget 3.0
+
+Повертає ненульовий код виходу, якщо старт перевищує бюджет.
+"""
+
+import argparse
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+def measure_imports(python: str):
+    """Час імпорту main.py за модулями (python -X importtime)"""
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-2000:])
+        raise SystemExit("Failed to import main.py")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        # Рівень вкладеності імпорту визначається відступом
+        depth = (len(indent) - 1) // 2
+        modules.append((name, depth, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+
+    main_index = next((i for i, module in enumerate(modules) if module[0] == "main"), None)
+    if main_index is None:
+        return 0.0, []
+
+    # importtime друкує дочірні модулі перед батьківським: збираємо прямі імпорти main
+    direct = []
+    for name, depth, self_time, cumulative in reversed(modules[:main_index]):
+        if depth == 0:
+            break
+        if depth == 1:
+            direct.append((name, cumulative))
+
+    return modules[main_index][3], direct
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_request(python: str, path: str, timeout: float) -> float:
+    """Час від запуску процесу uvicorn до першої успішної відповіді"""
+    port = _free_port()
+    start_time = time.perf_counter()
+    process = subprocess.Popen(
+        [python, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while time.perf_counter() - start_time < timeout:
+            if process.poll() is not None:
+                raise SystemExit("uvicorn exited before serving the first request")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start_time
+            except OSError:
+                time.sleep(0.02)
+        raise SystemExit(f"No response from {path} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup benchmark for the backend")
+    parser.add_argument("--python", default=sys.executable)
+    parser.add_argument("--import-budget", type=float, default=1.0, help="Бюджет імпорту main.py, с")
+    parser.add_argument("--first-request-budget", type=float, default=3.0, help="Бюджет до першого запиту, с")
+    parser.add_argument("--path", default="/api/v1/status")
+    parser.add_argument("--top", type=int, default=15, help="Кількість найповільніших модулів у звіті")
+    parser.add_argument("--skip-server", action="store_true", help="Не вимірювати час до першого запиту")
+    args = parser.parse_args()
+
+    import_total, modules = measure_imports(args.python)
+
+    print(f"Import time of main.py: {import_total * 1000:.1f} ms")
+    print("Slowest imports of main.py (cumulative):")
+    for name, cumulative in sorted(modules, key=lambda m: m[1], reverse=True)[: args.top]:
+        print(f"  {cumulative * 1000:8.1f} ms  {name}")
+
+    failed = import_total > args.import_budget
+    if failed:
+        print(f"FAIL: import time exceeds budget of {args.import_budget * 1000:.0f} ms")
+
+    if not args.skip_server:
+        first_request = measure_first_request(args.python, args.path, timeout=max(args.first_request_budget * 5, 10))
+        print(f"Time to first request ({args.path}): {first_request * 1000:.1f} ms")
+        if first_request > args.first_request_budget:
+            print(f"FAIL: time to first request exceeds budget of {args.first_request_budget * 1000:.0f} ms")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Локальна заміна syndication endpoint-а для перевірки SyndicationBackend
+
+Запуск:
+    python benchmarks/syndication_standin.py --port 8081
+    SYNDICATION_BASE_URL=http://127.0.0.1:8081 python main.py
+
+Відповідає на GET /tweet-result?id=<status_id>&token=... прикладом JSON у форматі
+syndication API; id, що закінчується на 404, повертає 404, а на 410 - видалений
+пост (TweetTombstone). Пост з id, що не закінчується на 0, відповідає на пост
+id - 1 (ланцюжок для /analyze-thread).
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def sample_tweet(status_id: str) -> dict:
+    tweet = {
+        "__typename": "Tweet",
+        "id_str": status_id,
+        "text": f"Sample post {status_id} served by the local syndication stand-in",
+        "created_at": "2026-01-01T12:00:00.000Z",
+        "favorite_count": 1200,
+        "retweet_count": 345,
+        "conversation_count": 67,
+        "user": {"screen_name": "standin", "name": "Stand-in"},
+        "mediaDetails": [
+            {"type": "photo", "media_url_https": "https://pbs.twimg.com/media/standin.jpg"}
+        ],
+    }
+    if not status_id.endswith("0"):
+        tweet["in_reply_to_status_id_str"] = str(int(status_id) - 1)
+    return tweet
+
+
+class SyndicationHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        status_id = parse_qs(parsed.query).get("id", [""])[0]
+
+        if parsed.path != "/tweet-result" or not status_id.isdigit():
+            self.send_error(400)
+            return
+        if status_id.endswith("404"):
+            self.send_error(404)
+            return
+
+        if status_id.endswith("410"):
+            body = json.dumps({"__typename": "TweetTombstone"}).encode()
+        else:
+            body = json.dumps(sample_tweet(status_id)).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local syndication endpoint stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), SyndicationHandler)
+    print(f"Syndication stand-in listening on http://{args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
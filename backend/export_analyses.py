@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Twitter Analyzer - Export of stored analyses
+
+Приклади:
+    python export_analyses.py --since 2026-01-01 -o analyses.ndjson
+    python export_analyses.py --format parquet --compression zstd -o analyses.parquet
+    python export_analyses.py --compression gzip > analyses.ndjson.gz
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+from app.services.analysis_export import EXPORT_FORMATS, check_export_dependencies, iter_export
+from app.services.analysis_filter import AnalysisFilter
+from app.services.analysis_store import create_db_engine
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Потоковий експорт збережених аналізів")
+    parser.add_argument(
+        "--database-url",
+        default=os.getenv("DATABASE_URL", "sqlite:///data/analyses.sqlite3"),
+        help="URL бази даних (за замовчуванням DATABASE_URL)"
+    )
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("-o", "--output", help="Файл результату (за замовчуванням stdout)")
+
+    parser.add_argument("--status-id")
+    parser.add_argument("--author")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--status")
+    parser.add_argument("--sentiment")
+    parser.add_argument("--min-processing-time", type=float)
+    parser.add_argument("--max-processing-time", type=float)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    filters = AnalysisFilter(
+        status_id=args.status_id,
+        author=args.author,
+        since=args.since,
+        until=args.until,
+        status=args.status,
+        sentiment=args.sentiment,
+        min_processing_time=args.min_processing_time,
+        max_processing_time=args.max_processing_time
+    )
+
+    try:
+        check_export_dependencies(args.format, args.compression)
+    except RuntimeError as e:
+        raise SystemExit(str(e))
+
+    engine = create_db_engine(args.database_url)
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+
+    try:
+        for chunk in iter_export(engine, filters, args.format, args.compression, args.chunk_size):
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
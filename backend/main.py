@@ -4,17 +4,26 @@ Twitter Analyzer - Main Application Entry Point
 """
 
 import os
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseSettings
+from fastapi.responses import JSONResponse, ORJSONResponse
+from typing import Optional
+from pydantic import field_validator
+from pydantic_settings import BaseSettings
 
-from app.api.routes import twitter, health
+from app.api.routes import twitter, health, analyses
+from app.services.cache import SharedCache
+from app.services.engagement_tracker import EngagementTracker
+from app.services.prefetcher import Prefetcher
+from app.services.media_analyzer import MediaAnalyzer
+from app.services.scraper_backends import parse_backend_names
 from app.services.twitter_scraper import TwitterScraper
 from app.services.gpt_service import GPTService
+from app.utils.lazy import LazyService
 from app.utils.logger import setup_logging
 
 # Налаштування логування
@@ -28,12 +37,25 @@ class Settings(BaseSettings):
     debug: bool = False
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1
     
-    # OpenAI налаштування
-    openai_api_key: str
+    # Створення сервісів під час старту замість першого запиту
+    eager_init: bool = False
+    # Створення сервісів у фоні одразу після старту (старт не сповільнюється)
+    background_init: bool = True
+    
+    # OpenAI налаштування (ключ перевіряється при першому зверненні до GPT)
+    openai_api_key: Optional[str] = None
     openai_model: str = "gpt-4o-mini"
     openai_max_tokens: int = 500
     openai_temperature: float = 0.7
+    openai_timeout: float = 60.0
+    # Генерація не починається, якщо до дедлайну запиту лишилося менше
+    min_generation_time: float = 2.0
+    
+    # Наскрізний дедлайн /analyze (заголовок X-Request-Timeout, не більше максимуму)
+    request_timeout: float = 25.0
+    request_timeout_max: float = 120.0
     
     # CORS налаштування
     cors_origins: str = "http://localhost:3000"
@@ -41,26 +63,183 @@ class Settings(BaseSettings):
     # Rate limiting
     rate_limit: str = "100/hour"
     
+    # Кеш (спільний між воркерами)
+    redis_url: Optional[str] = None
+    cache_sqlite_path: str = "data/cache.sqlite3"
+    cache_ttl: int = 3600
+    cache_max_size: int = 1000
+    cache_local_ttl: int = 60
+    
+    # База даних (SQLite локально, Postgres у продакшні)
+    database_url: str = "sqlite:///data/analyses.sqlite3"
+    database_pool_size: int = 10
+    database_max_overflow: int = 20
+    store_batch_size: int = 100
+    store_flush_interval: float = 2.0
+    # Повтори запису пакета при тимчасових помилках бази
+    store_retry_attempts: int = 5
+    store_retry_backoff: float = 0.5
+    
+    # Скрейпінг Twitter
+    twitter_timeout: float = 30.0
+    twitter_retry_attempts: int = 3
+    twitter_hedge_percentile: float = 0.9
+    # Порядок бекендів: JSON syndication, потім повний HTML як fallback
+    twitter_backends: str = "syndication,html"
+    syndication_base_url: str = "https://cdn.syndication.twimg.com"
+    # Таймаут syndication-запиту (разом з повторами), щоб HTML fallback мав бюджет
+    syndication_timeout: float = 5.0
+    
+    # Відстеження статистики постів
+    engagement_refresh_interval: float = 300.0
+    engagement_concurrency: int = 8
+    
+    # Обхід розмови (/analyze-thread)
+    thread_concurrency: int = 4
+    thread_max_depth: int = 2
+    thread_max_posts: int = 20
+    
+    # Спекулятивний прогрів після /validate-url
+    prefetch_enabled: bool = True
+    prefetch_generation: bool = False
+    prefetch_concurrency: int = 2
+    prefetch_rate: float = 1.0
+    # Прогрів вимикається, коли у воркері стільки активних /analyze
+    prefetch_max_load: int = 4
+    prefetch_ttl: int = 600
+    
+    # Аналіз зображень
+    image_max_size: int = 5 * 1024 * 1024
+    image_per_host_limit: int = 4
+    image_decode_workers: int = 2
+    image_max_count: int = 4
+    # Ліміт пікселів для форматів без зменшеного декодування (PNG/GIF/WebP)
+    image_max_pixels: int = 4096 * 4096
+    image_analysis_timeout: float = 10.0
+    
+    @field_validator("twitter_backends")
+    @classmethod
+    def validate_twitter_backends(cls, value: str) -> str:
+        """Нормалізація списку бекендів ("syndication, html" -> "syndication,html")"""
+        return ",".join(parse_backend_names(value))
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
 
 settings = Settings()
 
+def _create_analysis_store():
+    # SQLAlchemy імпортується лише при створенні сховища (швидший старт)
+    from app.services.analysis_store import AnalysisStore, create_db_engine
+    
+    return AnalysisStore(
+        create_db_engine(
+            settings.database_url,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow
+        ),
+        batch_size=settings.store_batch_size,
+        flush_interval=settings.store_flush_interval,
+        retry_attempts=settings.store_retry_attempts,
+        retry_backoff=settings.store_retry_backoff
+    )
+
+def _create_gpt_service() -> GPTService:
+    return GPTService(
+        api_key=settings.openai_api_key,
+        model=settings.openai_model,
+        max_tokens=settings.openai_max_tokens,
+        temperature=settings.openai_temperature,
+        timeout=settings.openai_timeout,
+        min_generation_time=settings.min_generation_time
+    )
+
+async def _warm_up(services):
+    """Фонове створення сервісів після старту"""
+    for service in services:
+        try:
+            await service.ainstance()
+        except Exception as e:
+            logger.error(f"Warm-up of {service.service_name} failed: {e}")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Життєвий цикл додатку"""
     # Startup
     logger.info("Starting Twitter Analyzer application...")
     
-    # Ініціалізація сервісів
-    app.state.twitter_scraper = TwitterScraper()
-    app.state.gpt_service = GPTService(
-        api_key=settings.openai_api_key,
-        model=settings.openai_model,
-        max_tokens=settings.openai_max_tokens,
-        temperature=settings.openai_temperature
+    app.state.settings = settings
+    
+    # Ініціалізація сервісів: важкі сервіси створюються при першому використанні
+    app.state.cache = await SharedCache.create(
+        redis_url=settings.redis_url,
+        sqlite_path=settings.cache_sqlite_path,
+        default_ttl=settings.cache_ttl,
+        local_max_size=settings.cache_max_size,
+        local_ttl=settings.cache_local_ttl
+    )
+    app.state.analysis_store = LazyService("analysis_store", _create_analysis_store, lambda store: store.stop())
+    app.state.twitter_scraper = LazyService(
+        "twitter_scraper",
+        lambda: TwitterScraper(
+            timeout=settings.twitter_timeout,
+            retry_attempts=settings.twitter_retry_attempts,
+            hedge_percentile=settings.twitter_hedge_percentile,
+            backends=settings.twitter_backends.split(","),
+            syndication_base_url=settings.syndication_base_url,
+            syndication_timeout=settings.syndication_timeout
+        ),
+        lambda scraper: scraper.session.aclose()
+    )
+    app.state.media_analyzer = LazyService(
+        "media_analyzer",
+        lambda: MediaAnalyzer(
+            app.state.cache,
+            max_bytes=settings.image_max_size,
+            per_host_limit=settings.image_per_host_limit,
+            decode_workers=settings.image_decode_workers,
+            max_images=settings.image_max_count,
+            max_pixels=settings.image_max_pixels,
+            timeout=settings.image_analysis_timeout
+        ),
+        lambda analyzer: analyzer.close()
     )
+    app.state.gpt_service = LazyService("gpt_service", _create_gpt_service)
+    app.state.engagement_tracker = EngagementTracker(
+        app.state.twitter_scraper,
+        app.state.cache,
+        concurrency=settings.engagement_concurrency,
+        interval=settings.engagement_refresh_interval
+    )
+    app.state.engagement_tracker.start()
+    if settings.prefetch_enabled:
+        app.state.prefetcher = Prefetcher(
+            app.state.cache,
+            concurrency=settings.prefetch_concurrency,
+            rate=settings.prefetch_rate,
+            max_load=settings.prefetch_max_load,
+            ttl=settings.prefetch_ttl
+        )
+    
+    lazy_services = [
+        app.state.analysis_store,
+        app.state.twitter_scraper,
+        app.state.media_analyzer,
+        app.state.gpt_service
+    ]
+    
+    # Опціональний прогрів (EAGER_INIT=true) - повільніший старт, швидший перший запит
+    warm_up_task = None
+    if settings.eager_init:
+        for service in lazy_services:
+            try:
+                service.instance()
+            except Exception as e:
+                logger.error(f"Warm-up of {service.service_name} failed: {e}")
+    elif settings.background_init:
+        # Імпорти SQLAlchemy/OpenAI та створення клієнтів - у потоці, поза першим /analyze
+        warm_up_task = asyncio.create_task(_warm_up(lazy_services))
     
     logger.info("Application startup completed")
     
@@ -68,6 +247,14 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Twitter Analyzer application...")
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    await app.state.engagement_tracker.stop()
+    if settings.prefetch_enabled:
+        await app.state.prefetcher.stop()
+    for service in lazy_services:
+        await service.aclose()
+    await app.state.cache.close()
 
 # Створення FastAPI додатку
 app = FastAPI(
@@ -76,6 +263,7 @@ app = FastAPI(
     description="Додаток для аналізу Twitter-постів та генерації коментарів",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -96,6 +284,7 @@ app.add_middleware(
 # Підключення роутів
 app.include_router(health.router, prefix="/api/v1", tags=["health"])
 app.include_router(twitter.router, prefix="/api/v1", tags=["twitter"])
+app.include_router(analyses.router, prefix="/api/v1", tags=["analyses"])
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -122,5 +311,7 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        # Кілька воркерів несумісні з reload
+        workers=1 if settings.debug else settings.workers,
         log_level="info"
     )
@@ -0,0 +1,9 @@
+"""
+Спільні налаштування тестів backend
+"""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
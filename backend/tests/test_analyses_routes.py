@@ -0,0 +1,59 @@
+"""
+Тести історії аналізів (/api/v1/analyses)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import analyses
+from app.services.analysis_store import AnalysisStore, create_db_engine
+from app.utils.lazy import LazyService
+
+
+@pytest.fixture
+def client(tmp_path):
+    store = AnalysisStore(create_db_engine(f"sqlite:///{tmp_path / 'analyses.sqlite3'}"))
+    store._insert_batch([{
+        "status_id": "123",
+        "url": "https://x.com/example/status/123",
+        "author": "@example",
+        "post": {"text": "Hello"},
+        "comments": ["Коментар"],
+        "analysis": {"sentiment": "позитивний"},
+        "processing_time": 1.5,
+        "created_at": datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+    }])
+
+    app = FastAPI()
+    # Як у main.py: сховище створюється при першому зверненні через проксі
+    app.state.analysis_store = LazyService("analysis_store", lambda: store)
+    app.include_router(analyses.router, prefix="/api/v1")
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+    store.engine.dispose()
+
+
+def test_get_analysis_by_id(client):
+    response = client.get("/api/v1/analyses/1")
+
+    assert response.status_code == 200
+    assert response.json()["status_id"] == "123"
+    assert response.json()["comments"] == ["Коментар"]
+
+
+def test_get_missing_analysis(client):
+    response = client.get("/api/v1/analyses/999")
+
+    assert response.status_code == 404
+
+
+def test_list_analyses_by_author(client):
+    response = client.get("/api/v1/analyses", params={"author": "@example"})
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()["items"]] == [1]
@@ -0,0 +1,71 @@
+"""
+Тести сховища аналізів: відкладений запис пакетами
+"""
+
+import pytest
+
+from app.services.analysis_filter import AnalysisFilter
+from app.services.analysis_store import AnalysisStore, create_db_engine
+
+
+def make_row(status_id: str):
+    return {
+        "status_id": status_id,
+        "url": f"https://x.com/example/status/{status_id}",
+        "author": "@example",
+        "post": {"text": "Hello"},
+        "comments": ["Коментар"],
+        "analysis": {},
+        "processing_time": 1.0,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = AnalysisStore(
+        create_db_engine(f"sqlite:///{tmp_path / 'analyses.sqlite3'}"),
+        flush_interval=0.05,
+        retry_backoff=0.01,
+    )
+    yield store
+    store.engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_is_retried(store, monkeypatch):
+    insert_batch = store._insert_batch
+    attempts = 0
+
+    def flaky_insert(batch):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("database is locked")
+        insert_batch(batch)
+
+    monkeypatch.setattr(store, "_insert_batch", flaky_insert)
+
+    store.record(make_row("1"))
+    store.record(make_row("2"))
+    await store.stop()
+
+    assert attempts == 2
+    items = await store.query(AnalysisFilter())
+    assert sorted(item["status_id"] for item in items) == ["1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_flush_gives_up_after_retry_attempts(store, monkeypatch):
+    attempts = 0
+
+    def failing_insert(batch):
+        nonlocal attempts
+        attempts += 1
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(store, "_insert_batch", failing_insert)
+
+    store.record(make_row("1"))
+    await store.stop()
+
+    assert attempts == store.retry_attempts
@@ -0,0 +1,93 @@
+"""
+Тести спільного кешу: дедуплікація обчислень та дедлайн запиту
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.cache import SharedCache, SQLiteCacheBackend
+from app.utils.deadline import Deadline, DeadlineExceeded, current_deadline
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+@pytest.mark.asyncio
+async def test_computes_once_for_concurrent_callers(cache_path):
+    cache = SharedCache(SQLiteCacheBackend(cache_path))
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"value": 1}
+
+    results = await asyncio.gather(*(cache.get_or_compute("post:1", factory) for _ in range(5)))
+
+    assert results == [{"value": 1}] * 5
+    assert calls == 1
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_lock_wait_respects_request_deadline(cache_path):
+    cache = SharedCache(SQLiteCacheBackend(cache_path), lock_ttl=60.0)
+    # Обчислення "в іншому воркері", яке не завершиться до дедлайну
+    other_worker = SQLiteCacheBackend(cache_path)
+    assert await other_worker.acquire_lock("post:77", "other", 60.0)
+
+    async def factory():
+        return {"value": 77}
+
+    token = current_deadline.set(Deadline(0.5))
+    start_time = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await cache.get_or_compute("post:77", factory)
+    finally:
+        current_deadline.reset(token)
+
+    assert time.monotonic() - start_time < 1.5
+    await other_worker.close()
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_inflight_join_respects_request_deadline(cache_path):
+    cache = SharedCache(SQLiteCacheBackend(cache_path))
+    release = asyncio.Event()
+
+    async def slow_factory():
+        await release.wait()
+        return {"value": 1}
+
+    # Ініціатор без дедлайну, приєднаний запит - з коротким
+    initiator = asyncio.create_task(cache.get_or_compute("gen:1", slow_factory))
+    await asyncio.sleep(0.05)
+
+    token = current_deadline.set(Deadline(0.2))
+    try:
+        with pytest.raises(DeadlineExceeded):
+            await cache.get_or_compute("gen:1", slow_factory)
+    finally:
+        current_deadline.reset(token)
+
+    # Обчислення ініціатора не скасоване
+    release.set()
+    assert await initiator == {"value": 1}
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_atomic_counters(cache_path):
+    cache = SharedCache(SQLiteCacheBackend(cache_path))
+
+    await asyncio.gather(*(cache.increment("stats", {"hits": 1, "cost": 0.5}, 60) for _ in range(10)))
+
+    assert await cache.counters("stats") == {"hits": 10, "cost": 5.0}
+    await cache.close()
@@ -0,0 +1,64 @@
+"""
+Тести бекендів скрейпера: SyndicationBackend проти локальної заміни endpoint-а
+"""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from app.services.fetch_strategy import FetchStrategy
+from app.services.scraper_backends import SyndicationBackend, parse_backend_names
+from benchmarks.syndication_standin import SyndicationHandler
+
+
+@pytest.fixture(scope="module")
+def standin_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SyndicationHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def backend(standin_url):
+    async with httpx.AsyncClient() as session:
+        yield SyndicationBackend(FetchStrategy(session, max_attempts=1), base_url=standin_url, timeout=5.0)
+
+
+@pytest.mark.asyncio
+async def test_syndication_maps_post(backend):
+    url = "https://x.com/standin/status/1790000000000000001"
+    post = await backend.fetch_post(url, "1790000000000000001")
+
+    assert post["url"] == url
+    assert post["author"] == "@standin"
+    assert post["images"] == ["https://pbs.twimg.com/media/standin.jpg"]
+    assert (post["likes_count"], post["retweets_count"], post["replies_count"]) == (1200, 345, 67)
+    # Батьківський пост - для обходу розмови
+    assert post["related_status_ids"] == ["1790000000000000000"]
+
+
+@pytest.mark.asyncio
+async def test_syndication_missing_post(backend):
+    assert await backend.fetch_post("https://x.com/standin/status/1790000000000000404", "1790000000000000404") is None
+
+
+@pytest.mark.asyncio
+async def test_syndication_tombstone(backend):
+    assert await backend.fetch_post("https://x.com/standin/status/1790000000000000410", "1790000000000000410") is None
+
+
+def test_parse_backend_names():
+    assert parse_backend_names(" Syndication, html ,") == ["syndication", "html"]
+    assert parse_backend_names(["html"]) == ["html"]
+
+
+@pytest.mark.parametrize("value", ["syndication,graphql", " , "])
+def test_parse_backend_names_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        parse_backend_names(value)
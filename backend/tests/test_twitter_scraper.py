@@ -0,0 +1,74 @@
+"""
+Тести парсингу статистики Twitter-посту
+"""
+
+import pytest
+from bs4 import BeautifulSoup, SoupStrainer
+
+from app.services.twitter_scraper import STATS_ATTRS, TwitterScraper, parse_count
+
+# Кнопки під постом: 12 відповідей, 3 репости, 0 лайків (число лише в тексті)
+STATS_HTML = """
+<article>
+  <div data-testid="tweetText">Hello</div>
+  <div role="group">
+    <div><button data-testid="reply" aria-label="Reply"><span>12</span></button></div>
+    <div><button data-testid="retweet" aria-label="Repost"><span>3</span></button></div>
+    <div><button data-testid="like" aria-label="Like"><span></span></button></div>
+  </div>
+</article>
+"""
+
+
+@pytest.fixture
+def scraper():
+    return TwitterScraper()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1234 Likes", 1234),
+    ("1.2K", 1200),
+    ("3,456", 3456),
+    ("2M", 2_000_000),
+    ("1.5B", 1_500_000_000),
+    ("12 Replies. Reply", 12),
+    ("5 Kudos", 5),
+    ("Like", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_count(text, expected):
+    assert parse_count(text) == expected
+
+
+def test_extract_stats_full_parse(scraper):
+    soup = BeautifulSoup(STATS_HTML, "html.parser")
+
+    assert scraper._extract_stats(soup) == {"likes": 0, "retweets": 3, "replies": 12}
+
+
+def test_extract_stats_strainer_does_not_join_counts(scraper):
+    # Без обгорток батьком кнопок стає корінь документа з текстом "123"
+    soup = BeautifulSoup(STATS_HTML, "html.parser", parse_only=SoupStrainer(attrs=STATS_ATTRS))
+
+    assert scraper._extract_stats(soup) == {"likes": 0, "retweets": 3, "replies": 12}
+
+
+def test_extract_stats_prefers_exact_aria_label(scraper):
+    html = '<button data-testid="like" aria-label="1234 Likes. Like"><span>1.2K</span></button>'
+    soup = BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(attrs=STATS_ATTRS))
+
+    assert scraper._extract_stats(soup)["likes"] == 1234
+
+
+def test_extract_stats_count_next_to_button(scraper):
+    html = '<div><button data-testid="like" aria-label="Like"></button><span>7</span></div>'
+    soup = BeautifulSoup(html, "html.parser")
+
+    assert scraper._extract_stats(soup)["likes"] == 7
+
+
+def test_extract_stats_without_stats_elements(scraper):
+    soup = BeautifulSoup("<article>No stats</article>", "html.parser")
+
+    assert scraper._extract_stats(soup) == {"likes": None, "retweets": None, "replies": None}